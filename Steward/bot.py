@@ -3,15 +3,18 @@ from typing import Union
 import discord
 import logging
 from discord.ext import commands
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncEngine
 from timeit import default_timer as timer
 
-from Steward.models import metadata
 
 from Steward.models.embeds import ErrorEmbed
 from Steward.models.objects.exceptions import StewardCommandError, StewardError
+from Steward.utils.cacheUtils import CacheInvalidationListener
+from Steward.utils.dbUtils import attach_replica, build_engine
+from Steward.utils.migrationUtils import run_migrations
 from Steward.utils.discordUtils import try_delete
-from constants import DB_URL, ERROR_CHANNEL 
+from Steward.utils.trackingUtils import tracked_messages
+from constants import DB_REPLICA_URL, DB_URL, ERROR_CHANNEL 
 
 # Important for metadata initiation
 from Steward.models.objects.npc import NPC
@@ -20,13 +23,15 @@ from Steward.models.objects.character import Character
 from Steward.models.objects.log import StewardLog
 from Steward.models.objects.levels import Levels
 from Steward.models.objects.servers import Server
-from Steward.models.objects.player import Player
+from Steward.models.objects.player import CommandStatsBuffer, Player
 from Steward.models.objects.activity import Activity
 from Steward.models.objects.rules import StewardRule
 from Steward.models.objects.request import Request
 from Steward.models.objects.form import FormTemplate, Application
 from Steward.models.objects.patrol import Patrol
 from Steward.models.objects.dashboards import CategoryDashboard
+from Steward.models.objects.auctionHouse import AuctionHouse
+from Steward.models.objects.postStats import PostStats
 
 log = logging.getLogger(__name__)
 
@@ -58,35 +63,96 @@ class StewardApplicationContext(discord.ApplicationContext):
     
 class StewardBot(commands.Bot):
     db: AsyncEngine
+    command_stats: CommandStatsBuffer
+    cache_listener: CacheInvalidationListener
 
     def __init__(self, **options):
         super(StewardBot, self).__init__(**options)
+        # Commands are refused until the startup cache warm-up has finished
+        self.warmed_up = False
         # Compendium
 
         self.check(self.bot_check)
         self.before_invoke(self.before_invoke_setup)
 
     async def on_ready(self):
-        db_start = timer()
+        # on_ready fires again after every gateway reconnect; the engine, its buffer, listener
+        # and the db_connected listeners' loops are set up once and live until close()
+        if not hasattr(self, "db"):
+            db_start = timer()
+            try:
+                log.info("Connecting to database...")
+                db = build_engine(DB_URL)
+
+                # Only publish the engine once it is migrated, so a failed attempt is retried on the next on_ready
+                try:
+                    if DB_REPLICA_URL:
+                        attach_replica(db, DB_REPLICA_URL)
+
+                    schema_version = await run_migrations(db)
+                except Exception:
+                    await db.dispose()
+                    raise
+
+                self.db = db
+
+                self.command_stats = CommandStatsBuffer(self.db)
+                self.command_stats.start()
+
+                # One LISTEN connection; it reconnects on its own
+                if self.db.dialect.name == "postgresql":
+                    self.cache_listener = CacheInvalidationListener(DB_URL)
+                    self.cache_listener.start()
+
+                db_end = timer()
+                log.info(f"Time to create db engine: {db_end - db_start:.2f} (schema version {schema_version})")
+                self.dispatch("db_connected")
+
+                await self.warm_caches()
+            except Exception:
+                log.exception("Failed during on_ready database setup")
+                raise
+
+        log.info(f"Logged in as {self.user} (ID: {self.user.id})")
+        log.info("------")
+
+    async def warm_caches(self) -> None:
+        """Hydrate server config, enabled rules and the tracked message index with one query per table."""
+        start = timer()
+
         try:
-            log.info("Connecting to database...")
-            self.db = create_async_engine(DB_URL)
+            timings = await Server.warm(self.db, self.guilds)
 
-            async with self.db.begin() as conn:
-                await conn.run_sync(metadata.create_all)
+            rules_start = timer()
+            rule_count = await StewardRule.warm(self.db, [guild.id for guild in self.guilds])
+            timings["rules"] = timer() - rules_start
 
-            db_end = timer()
-            log.info(f"Time to create db engine: {db_end - db_start:.2f}")
-            self.dispatch("db_connected")
+            tracked_start = timer()
+            tracked_count = await tracked_messages.load(self.db)
+            timings["tracked_messages"] = timer() - tracked_start
 
-            log.info(f"Logged in as {self.user} (ID: {self.user.id})")
-            log.info("------")
+            phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in timings.items())
+            log.info(
+                f"Warmed {len(Server._cache)} servers, {rule_count} rules and {tracked_count} tracked messages for {len(self.guilds)} guilds "
+                f"in {timer() - start:.2f}s ({phases})"
+            )
         except Exception:
-            log.exception("Failed during on_ready database setup")
-            raise
+            # Caches fill lazily instead; don't keep commands locked out
+            log.exception("Cache warm-up failed")
+        finally:
+            self.warmed_up = True
 
     async def close(self):
         log.info("Cleaning up and shutting down")
+        if hasattr(self, "command_stats"):
+            try:
+                await self.command_stats.stop()
+            except Exception:
+                log.exception("Failed to flush command statistics on shutdown")
+
+        if hasattr(self, "cache_listener"):
+            await self.cache_listener.stop()
+
         if hasattr(self, "db"):
             await self.db.dispose()
 
@@ -108,6 +174,7 @@ class StewardBot(commands.Bot):
         if (
             hasattr(self, "db")
             and self.db
+            and self.warmed_up
         ):
             return True
         
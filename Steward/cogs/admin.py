@@ -9,7 +9,8 @@ from timeit import default_timer as timer
 
 
 from Steward.bot import StewardBot
-from Steward.utils.discordUtils import is_owner
+from Steward.utils.dbUtils import get_pool_metrics, get_replica, query_stats
+from Steward.utils.discordUtils import chunk_text, is_owner
 from constants import ADMIN_GUILDS
 
 log = logging.getLogger(__name__)
@@ -35,6 +36,68 @@ class AdminCog(commands.Cog):
     async def admin(self, ctx: discord.ApplicationContext):
         await ctx.send("Send a subcommand")
 
+    @admin.command(hidden=True, name="pool")
+    @commands.check(is_owner)
+    async def admin_pool(self, ctx: discord.ApplicationContext):
+        if not getattr(self.bot, "db", None):
+            return await ctx.send("No pool metrics available")
+
+        sections = []
+
+        for label, engine in (("primary", self.bot.db), ("replica", get_replica(self.bot.db))):
+            metrics = get_pool_metrics(engine) if engine else None
+
+            if not metrics:
+                continue
+
+            body = "\n".join(
+                f"{key:<18} {value:.2f}" if isinstance(value, float) else f"{key:<18} {value}"
+                for key, value in metrics.snapshot().items()
+            )
+            sections.append(f"[{label}]\n{body}")
+
+        await ctx.send("```\n{}\n```".format("\n\n".join(sections) or "No pool metrics available"))
+
+    @admin.command(hidden=True, name="queries")
+    @commands.check(is_owner)
+    async def admin_queries(self, ctx: discord.ApplicationContext, sort_by: str = "total", limit: int = 10):
+        """Top statement shapes by total/count/p95/p99/max/rows/slow"""
+        if sort_by == "reset":
+            query_stats.reset()
+            return await ctx.send("Query stats reset")
+
+        sort_key = sort_by if sort_by in ("count", "rows", "slow") else f"{sort_by}_ms"
+        shapes = query_stats.top(sort_key, limit)
+
+        if not shapes:
+            return await ctx.send("No queries recorded")
+
+        body = "\n\n".join(
+            f"{s['count']}x total={s['total_ms']:.0f}ms p50={s['p50_ms']:.1f} p95={s['p95_ms']:.1f} p99={s['p99_ms']:.1f} max={s['max_ms']:.1f} avg_rows={s['avg_rows']:.1f} slow={s['slow']}\n"
+            f"{textwrap.shorten(s['sql'], 300)}"
+            + "".join(f"\n  <- {site} ({n})" for site, n in s["slow_sites"].items())
+            for s in shapes
+        )
+
+        for chunk in chunk_text(body, 1900):
+            await ctx.send(f"```\n{chunk}\n```")
+
+    @admin.command(hidden=True, name="slow")
+    @commands.check(is_owner)
+    async def admin_slow(self, ctx: discord.ApplicationContext, limit: int = 10):
+        slow = list(query_stats.slow_queries)[-limit:]
+
+        if not slow:
+            return await ctx.send("No slow queries recorded")
+
+        body = "\n\n".join(
+            f"{q['ms']:.1f}ms rows={q['rows']} {q['site']}\n{textwrap.shorten(q['sql'], 300)}"
+            for q in reversed(slow)
+        )
+
+        for chunk in chunk_text(body, 1900):
+            await ctx.send(f"```\n{chunk}\n```")
+
     @admin.command(hidden=True, name="eval")
     @commands.check(is_owner)
     async def admin_eval(self, ctx: discord.ApplicationContext, *, body: str):
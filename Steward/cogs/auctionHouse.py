@@ -23,7 +23,7 @@ class AuctionHouseCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_db_connected(self):
-        houses = await AuctionHouse.fetch_all(self.bot)
+        houses = await AuctionHouse.fetch_all(self.bot, replica=True)
 
         for house in houses:
             await house.refresh_view()
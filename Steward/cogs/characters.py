@@ -15,6 +15,7 @@ from Steward.models.views.player import PlayerInfoView
 from Steward.models.views.request import PlayerRequestView, StaffRequestView, Requestview
 from Steward.utils.autocompleteUtils import form_autocomplete, character_autocomplete
 from Steward.utils.discordUtils import dm_check, is_admin, is_staff, try_delete
+from Steward.utils.trackingUtils import tracked_messages
 from Steward.utils.viewUitils import get_activity_select_option
 
 
@@ -57,7 +58,7 @@ class CharacterCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message_delete(self, message: discord.Message):
-        if not hasattr(self.bot, "db"):
+        if not hasattr(self.bot, "db") or not tracked_messages.might_track("request", message.id):
             return
 
         if (request := await Request.fetch(self.bot, message.id)):
@@ -65,6 +66,9 @@ class CharacterCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_thread_delete(self, thread: discord.Thread):
+        if not hasattr(self.bot, "db") or not tracked_messages.might_track("application", thread.id):
+            return
+
         if (application := await Application.fetch_by_message_id(self.bot.db, thread.guild.id, thread.id)):
             await application.delete()
 
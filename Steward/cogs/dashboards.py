@@ -20,7 +20,7 @@ class DashboardCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_db_connected(self):
-        dashboards = await CategoryDashboard.fetch_all(self.bot)
+        dashboards = await CategoryDashboard.fetch_all(self.bot, replica=True)
 
         for dashboard in dashboards:
             await dashboard.refresh()
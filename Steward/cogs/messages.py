@@ -1,6 +1,7 @@
 import logging
 import discord
-from discord.ext import commands
+from datetime import datetime, timedelta, timezone
+from discord.ext import commands, tasks
 
 
 from Steward.bot import StewardBot, StewardApplicationContext
@@ -8,6 +9,7 @@ from Steward.models.modals import get_value_modal
 from Steward.models.modals.messages import SayEditModal
 from Steward.models.objects.enum import WebhookType
 from Steward.models.objects.exceptions import StewardError
+from Steward.models.objects.postStats import PostStats, month_start, week_start
 from Steward.models.objects.webhook import StewardWebhook
 from Steward.models.objects.request import Request
 from Steward.models.views import confirm_view
@@ -27,6 +29,30 @@ class MessageCog(commands.Cog):
         self.bot = bot
         log.info(f"Cog '{self.__cog_name__}' loaded")
 
+    @commands.Cog.listener()
+    async def on_db_connected(self):
+        # Days touched in the last interval before a restart were only tracked in memory. They
+        # fall in the current or previous week/month, so rebuild all four periods
+        today = datetime.now(timezone.utc).date()
+
+        try:
+            await PostStats.rollup(self.bot.db, {today, week_start(today) - timedelta(days=1), month_start(today) - timedelta(days=1)})
+        except Exception:
+            log.exception("Failed to roll up post statistics on startup")
+
+        if not self.post_stats_rollup.is_running():
+            self.post_stats_rollup.start()
+
+    def cog_unload(self):
+        self.post_stats_rollup.cancel()
+
+    @tasks.loop(minutes=15)
+    async def post_stats_rollup(self):
+        try:
+            await PostStats.rollup(self.bot.db)
+        except Exception:
+            log.exception("Failed to roll up post statistics")
+
     @commands.message_command(name="Edit")
     async def message_edit(self, ctx: StewardApplicationContext, message: discord.Message):
         # Character Message
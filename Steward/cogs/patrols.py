@@ -12,6 +12,7 @@ from Steward.models.views import confirm_view
 from Steward.models.views.patrol import PatrolView
 from Steward.utils.autocompleteUtils import patrol_outcome_autocomplete
 from Steward.utils.discordUtils import is_admin
+from Steward.utils.trackingUtils import tracked_messages
 from constants import CHANNEL_BREAK
 
 log = logging.getLogger(__name__)
@@ -52,7 +53,7 @@ class PatrolCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message_delete(self, message: discord.Message):
-        if not hasattr(self.bot, "db"):
+        if not hasattr(self.bot, "db") or not tracked_messages.might_track("patrol", message.id):
             return
 
         if (patrol := await Patrol.fetch(self.bot, message.channel, message.id)):
@@ -0,0 +1,584 @@
+"""
+Closure-compiling backend for automation expressions.
+
+`compile_expression` turns a parsed expression into nested Python closures once, so
+evaluating it again is a chain of plain function calls instead of an AST walk with
+per-node method dispatch. It mirrors `StewardEvaluator` node for node: the same limits
+are counted at the same points and the same exceptions are raised with the same
+messages, so either backend can be used for any expression.
+"""
+
+import ast
+import operator
+
+from typing import Any, Callable, Mapping, Optional
+from Steward.models.automation.exceptions import InvalidExpression, LimitException, StewardValueError
+
+
+class Frame:
+    """
+    Per-evaluation state shared by every closure of a program. Programs keep nothing
+    else between calls, so one program can run re-entrantly and from many callers.
+    """
+    __slots__ = ("config", "builtins", "statements", "loops", "max_statements")
+
+    def __init__(self, config, builtins: Mapping[str, Any]):
+        self.config = config
+        self.builtins = builtins
+        self.statements = 0
+        self.loops = 0
+        self.max_statements = config.max_statements
+
+
+# program(frame, names) -> value. `names` overlays frame.builtins: a name is looked up in
+# `names` first, the same precedence as the tree-walker's {**builtins, **names}, without
+# building that merged dict per evaluation or per comprehension item.
+Program = Callable[[Frame, dict], Any]
+
+_MISSING = object()
+
+
+def safe_pow(config, base, exp):
+    """Power with the configured base/exponent limits"""
+    if abs(base) > config.max_power_base:
+        raise LimitException(
+            f"Power base {base} exceeds maximum {config.max_power_base}",
+            None, ""
+        )
+    if abs(exp) > config.max_power:
+        raise LimitException(
+            f"Power exponent {exp} exceeds maximum {config.max_power}",
+            None, ""
+        )
+    return base ** exp
+
+
+def attribute_error(config, attr: str) -> Optional[str]:
+    """Why `attr` may not be accessed under `config`, or None if it may"""
+    for prefix in config.disallow_prefixes:
+        if attr.startswith(prefix):
+            return f"Access to attribute '{attr}' is not allowed"
+
+    if attr in config.disallow_methods:
+        return f"Access to method '{attr}' is not allowed"
+
+    return None
+
+
+def _statement_limit(frame: Frame):
+    raise LimitException(
+        f"Expression exceeded maximum statements ({frame.config.max_statements})",
+        None, ""
+    )
+
+
+def _loop_limit(frame: Frame):
+    raise LimitException(
+        f"Expression exceeded maximum loops ({frame.config.max_loops})",
+        None, ""
+    )
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+COMPARISON_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda x, y: x in y,
+    ast.NotIn: lambda x, y: x not in y,
+}
+
+
+def compile_expression(tree: ast.Expression) -> Program:
+    """Compile a tree from `ast.parse(expr, mode='eval')`. Never raises for unsupported nodes;
+    like the tree-walker, those only fail if evaluation actually reaches them."""
+    return _compile(tree.body)
+
+
+def _compile(node) -> Program:
+    compiler = _COMPILERS.get(type(node))
+
+    if compiler is None:
+        return _unsupported(node)
+
+    return compiler(node)
+
+
+def _unsupported(node) -> Program:
+    message = f"Expression type {type(node).__name__} is not supported"
+
+    def run(frame, names):
+        raise InvalidExpression(message, node, "")
+
+    return run
+
+
+def _compile_constant(node: ast.Constant) -> Program:
+    value = node.value
+
+    if isinstance(value, (str, bytes)):
+        length = len(value)
+
+        def run(frame, names):
+            frame.statements += 1
+            if frame.statements > frame.max_statements:
+                _statement_limit(frame)
+
+            if length > frame.config.max_const_len:
+                raise LimitException(
+                    f"Constant length {length} exceeds maximum {frame.config.max_const_len}",
+                    node, ""
+                )
+
+            return value
+
+        return run
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        return value
+
+    return run
+
+
+def _compile_name(node: ast.Name) -> Program:
+    name = node.id
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        value = names.get(name, _MISSING)
+
+        if value is _MISSING:
+            value = frame.builtins.get(name, _MISSING)
+
+            if value is _MISSING:
+                raise StewardValueError(f"Name '{name}' is not defined", node, "")
+
+        return value
+
+    return run
+
+
+def _compile_attribute(node: ast.Attribute) -> Program:
+    value = _compile(node.value)
+    attr = node.attr
+
+    # The verdict for the last config seen; evaluators almost always share one
+    checked_config = None
+    error = None
+
+    def run(frame, names):
+        nonlocal checked_config, error
+
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        obj = value(frame, names)
+
+        if frame.config is not checked_config:
+            error = attribute_error(frame.config, attr)
+            checked_config = frame.config
+
+        if error:
+            raise StewardValueError(error, node, "")
+
+        try:
+            return getattr(obj, attr)
+        except AttributeError:
+            raise StewardValueError(
+                f"Object has no attribute '{attr}'",
+                node, ""
+            )
+
+    return run
+
+
+def _compile_binop(node: ast.BinOp) -> Program:
+    left = _compile(node.left)
+    right = _compile(node.right)
+
+    if isinstance(node.op, ast.Pow):
+        def run(frame, names):
+            frame.statements += 1
+            if frame.statements > frame.max_statements:
+                _statement_limit(frame)
+
+            base = left(frame, names)
+            exp = right(frame, names)
+            return safe_pow(frame.config, base, exp)
+
+        return run
+
+    op = BINARY_OPERATORS.get(type(node.op))
+
+    if op is None:
+        message = f"Operator {type(node.op).__name__} is not supported"
+
+        def run(frame, names):
+            frame.statements += 1
+            if frame.statements > frame.max_statements:
+                _statement_limit(frame)
+
+            left(frame, names)
+            right(frame, names)
+            raise InvalidExpression(message, node, "")
+
+        return run
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        return op(left(frame, names), right(frame, names))
+
+    return run
+
+
+def _compile_unaryop(node: ast.UnaryOp) -> Program:
+    operand = _compile(node.operand)
+
+    if isinstance(node.op, ast.Not):
+        def run(frame, names):
+            frame.statements += 1
+            if frame.statements > frame.max_statements:
+                _statement_limit(frame)
+
+            return not operand(frame, names)
+
+        return run
+
+    op = UNARY_OPERATORS.get(type(node.op))
+
+    if op is None:
+        message = f"Unary operator {type(node.op).__name__} is not supported"
+
+        def run(frame, names):
+            frame.statements += 1
+            if frame.statements > frame.max_statements:
+                _statement_limit(frame)
+
+            operand(frame, names)
+            raise InvalidExpression(message, node, "")
+
+        return run
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        return op(operand(frame, names))
+
+    return run
+
+
+def _compile_compare(node: ast.Compare) -> Program:
+    left = _compile(node.left)
+    steps = [
+        (COMPARISON_OPERATORS.get(type(op)), type(op).__name__, _compile(comparator))
+        for op, comparator in zip(node.ops, node.comparators)
+    ]
+
+    if len(steps) == 1 and steps[0][0] is not None:
+        op, _, right = steps[0]
+
+        def run(frame, names):
+            frame.statements += 1
+            if frame.statements > frame.max_statements:
+                _statement_limit(frame)
+
+            return True if op(left(frame, names), right(frame, names)) else False
+
+        return run
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        current = left(frame, names)
+
+        for op, op_name, comparator in steps:
+            value = comparator(frame, names)
+
+            if op is None:
+                raise InvalidExpression(
+                    f"Comparison operator {op_name} is not supported",
+                    node, ""
+                )
+
+            if not op(current, value):
+                return False
+
+            current = value
+
+        return True
+
+    return run
+
+
+def _compile_boolop(node: ast.BoolOp) -> Program:
+    values = [_compile(value) for value in node.values]
+
+    if isinstance(node.op, ast.And):
+        def run(frame, names):
+            frame.statements += 1
+            if frame.statements > frame.max_statements:
+                _statement_limit(frame)
+
+            last_value = None
+            for value in values:
+                last_value = value(frame, names)
+                if not last_value:
+                    return last_value
+            return last_value
+
+        return run
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        last_value = None
+        for value in values:
+            last_value = value(frame, names)
+            if last_value:
+                return last_value
+        return last_value
+
+    return run
+
+
+def _compile_ifexp(node: ast.IfExp) -> Program:
+    test = _compile(node.test)
+    body = _compile(node.body)
+    orelse = _compile(node.orelse)
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        if test(frame, names):
+            return body(frame, names)
+        else:
+            return orelse(frame, names)
+
+    return run
+
+
+def _compile_call(node: ast.Call) -> Program:
+    func = _compile(node.func)
+    args = [_compile(arg) for arg in node.args]
+    keywords = [(keyword.arg, _compile(keyword.value)) for keyword in node.keywords]
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        function = func(frame, names)
+        values = [arg(frame, names) for arg in args]
+        kwargs = {name: value(frame, names) for name, value in keywords}
+
+        if not callable(function):
+            raise StewardValueError(f"'{function}' is not callable", node, "")
+
+        return function(*values, **kwargs)
+
+    return run
+
+
+def _compile_list(node: ast.List) -> Program:
+    elts = [_compile(elt) for elt in node.elts]
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        return [elt(frame, names) for elt in elts]
+
+    return run
+
+
+def _compile_tuple(node: ast.Tuple) -> Program:
+    elts = [_compile(elt) for elt in node.elts]
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        return tuple(elt(frame, names) for elt in elts)
+
+    return run
+
+
+def _compile_dict(node: ast.Dict) -> Program:
+    # A `**mapping` entry has no key node; the tree-walker fails on it when it gets there
+    items = [(_compile(key), _compile(value)) for key, value in zip(node.keys, node.values)]
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        return {key(frame, names): value(frame, names) for key, value in items}
+
+    return run
+
+
+def _compile_subscript(node: ast.Subscript) -> Program:
+    value = _compile(node.value)
+    key = _compile(node.slice)
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        obj = value(frame, names)
+        index = key(frame, names)
+
+        try:
+            return obj[index]
+        except (KeyError, IndexError, TypeError) as e:
+            raise StewardValueError(f"Subscript error: {e}", node, "")
+
+    return run
+
+
+def _compile_target(target) -> Callable[[Any, dict], None]:
+    if isinstance(target, ast.Name):
+        name = target.id
+
+        def assign(value, names):
+            names[name] = value
+
+        return assign
+
+    if isinstance(target, (ast.Tuple, ast.List)):
+        elts = [_compile_target(elt) for elt in target.elts]
+
+        def assign(value, names):
+            if not isinstance(value, (list, tuple)):
+                raise InvalidExpression("Cannot unpack non-iterable in comprehension", target, "")
+            if len(elts) != len(value):
+                raise InvalidExpression("Unpack mismatch in comprehension", target, "")
+            for elt, item in zip(elts, value):
+                elt(item, names)
+
+        return assign
+
+    def assign(value, names):
+        raise InvalidExpression("Unsupported comprehension target", target, "")
+
+    return assign
+
+
+def _compile_generators(generators: list[ast.comprehension], elt: Program):
+    """
+    Returns `run(frame, names)`, a generator function over the comprehension. Every item
+    is bound into its own copy of the incoming names, so targets never leak outwards.
+    """
+    if not generators:
+        def run(frame, names):
+            yield elt(frame, names)
+
+        return run
+
+    generator = generators[0]
+    iterable = _compile(generator.iter)
+    assign = _compile_target(generator.target)
+    ifs = [_compile(test) for test in generator.ifs]
+    inner = _compile_generators(generators[1:], elt)
+
+    def run(frame, names):
+        for item in iterable(frame, names):
+            frame.loops += 1
+            if frame.loops > frame.config.max_loops:
+                _loop_limit(frame)
+
+            scope = names.copy()
+            assign(item, scope)
+
+            if ifs and not all(test(frame, scope) for test in ifs):
+                continue
+
+            yield from inner(frame, scope)
+
+    return run
+
+
+def _compile_generatorexp(node: ast.GeneratorExp) -> Program:
+    comprehension = _compile_generators(node.generators, _compile(node.elt))
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        # Lazy, like the tree-walker: nothing is evaluated until the first item is pulled
+        return comprehension(frame, names.copy())
+
+    return run
+
+
+def _compile_listcomp(node: ast.ListComp) -> Program:
+    generator = _compile_generatorexp(node)
+
+    def run(frame, names):
+        frame.statements += 1
+        if frame.statements > frame.max_statements:
+            _statement_limit(frame)
+
+        return list(generator(frame, names))
+
+    return run
+
+
+_COMPILERS: dict[type, Callable[[Any], Program]] = {
+    ast.Constant: _compile_constant,
+    ast.Name: _compile_name,
+    ast.Attribute: _compile_attribute,
+    ast.BinOp: _compile_binop,
+    ast.UnaryOp: _compile_unaryop,
+    ast.Compare: _compile_compare,
+    ast.BoolOp: _compile_boolop,
+    ast.IfExp: _compile_ifexp,
+    ast.Call: _compile_call,
+    ast.List: _compile_list,
+    ast.Tuple: _compile_tuple,
+    ast.Dict: _compile_dict,
+    ast.Subscript: _compile_subscript,
+    ast.GeneratorExp: _compile_generatorexp,
+    ast.ListComp: _compile_listcomp,
+}
@@ -1,13 +1,20 @@
 import ast
 import time
-import operator
 
+from collections import OrderedDict
 from math import ceil, floor, sqrt
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+from Steward.models.automation.compiler import (
+    BINARY_OPERATORS, COMPARISON_OPERATORS, UNARY_OPERATORS,
+    Frame, Program, attribute_error, compile_expression, safe_pow
+)
 from Steward.models.automation.functions import rand, randint, typeof
 from Steward.models.automation.exceptions import InvalidExpression, StewardValueError, LimitException
 from Steward.models.automation.context import AutomationContext
+from Steward.models.objects.enum import ExpressionKind
 from Steward.models.objects.patrol import Patrol
+from constants import EXPRESSION_BACKEND, EXPRESSION_CACHE_SIZE
 
 class SafeObject:
     """Base class for safe wrapper objects that restricts access to dangerous methods"""
@@ -144,7 +151,7 @@ def safe_getattr(obj, attr, default=''):
         return default
     return getattr(obj, attr, default)
 
-DEFAULT_BUILTINS = {
+DEFAULT_BUILTINS = MappingProxyType({
     "floor": floor,
     "ceil": ceil,
     "round": round,
@@ -167,7 +174,18 @@ DEFAULT_BUILTINS = {
     "str": str,
     "bool": bool,
     "getattr": safe_getattr
-}
+})
+
+# Builtins that can answer differently each call, so results using them are never shared
+IMPURE_BUILTINS = frozenset({"rand", "randint", "time"})
+
+# Names an AutomationContext provides
+CONTEXT_NAMES = frozenset(name for name in vars(AutomationContext) if not name.startswith('_'))
+
+# Result types safe to hand every caller as the same object
+FOLDABLE_TYPES = (int, float, str, bool, type(None))
+
+_MISSING = object()
 
 class StewardConfig:
     def __init__(
@@ -197,59 +215,192 @@ class StewardConfig:
         self.disallow_methods = disallow_methods
 
 
+class StaticExpression:
+    """
+    The result of reading an expression without running it: its ExpressionKind, the names
+    it reads and, for constants, the folded value.
+    A constant only folds when evaluating it with no names succeeds and gives a scalar;
+    ones that fail or build a list keep being evaluated, so callers see the same results
+    and errors as before.
+    """
+
+    __slots__ = ("kind", "names", "value")
+
+    def __init__(self, kind: ExpressionKind, names: frozenset[str], value: Any = _MISSING):
+        self.kind = kind
+        self.names = names
+        self.value = value
+
+    @property
+    def folded(self) -> bool:
+        return self.value is not _MISSING
+
+    def shadowed(self, context: Optional[AutomationContext], extra_vars: Dict[str, Any]) -> bool:
+        """Whether the context or extra variables replace a builtin the folded value used."""
+        if not self.names:
+            return False
+
+        return bool(self.names & extra_vars.keys()) or (context is not None and bool(self.names & context.__dict__.keys()))
+
+    @classmethod
+    def analyze(cls, tree: ast.Expression, expr: str, cache: "ExpressionCache") -> "StaticExpression":
+        loaded = set()
+        bound = set()
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                (loaded if isinstance(node.ctx, ast.Load) else bound).add(node.id)
+
+        # Comprehension variables are local, unless they reuse a context name
+        names = frozenset(loaded - (bound - CONTEXT_NAMES))
+        free = names - DEFAULT_BUILTINS.keys()
+
+        if names & IMPURE_BUILTINS or free - {"server"}:
+            return cls(ExpressionKind.context, names)
+
+        if free:
+            return cls(ExpressionKind.server, names)
+
+        try:
+            value = get_evaluator(cache).eval(expr, {})
+        except Exception:
+            return cls(ExpressionKind.constant, names)
+
+        return cls(ExpressionKind.constant, names, value if isinstance(value, FOLDABLE_TYPES) else _MISSING)
+
+
+class ExpressionCache:
+    """
+    Bounded LRU of parsed expressions keyed by their text, so the same server limit,
+    activity and rule expressions are only run through `ast.parse` once.
+    Syntax errors are cached too and re-raised as InvalidExpression on every lookup.
+    Cached trees are shared by every evaluation and must never be mutated.
+    """
+
+    def __init__(self, max_size: int = EXPRESSION_CACHE_SIZE):
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        # Parsed tree, or the syntax error message
+        self._entries: "OrderedDict[str, Union[ast.Expression, str]]" = OrderedDict()
+        # Compiled on first use by CompiledEvaluator, evicted with the tree
+        self._programs: Dict[str, Program] = {}
+        # Classified on first use by evaluate_expression, evicted with the tree
+        self._static: Dict[str, StaticExpression] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, expr: str) -> bool:
+        return expr in self._entries
+
+    def parse(self, expr: str, count: bool = True) -> ast.Expression:
+        """
+        The parsed tree for `expr`. Every actual parse counts as a miss; `count=False` is for
+        lookups made alongside an evaluation that counts its own hit.
+        """
+        entry = self._entries.get(expr)
+
+        if entry is None:
+            self.misses += 1
+
+            try:
+                entry = ast.parse(expr, mode='eval')
+            except SyntaxError as e:
+                entry = f"Syntax error in expression: {e}"
+
+            self._entries[expr] = entry
+
+            if len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._programs.pop(evicted, None)
+                self._static.pop(evicted, None)
+        else:
+            if count:
+                self.hits += 1
+            self._entries.move_to_end(expr)
+
+        if isinstance(entry, str):
+            raise InvalidExpression(entry, None, expr)
+
+        return entry
+
+    def compile(self, expr: str) -> Program:
+        tree = self.parse(expr)
+        program = self._programs.get(expr)
+
+        if program is None:
+            try:
+                program = self._programs[expr] = compile_expression(tree)
+            except RecursionError:
+                raise LimitException("Expression exceeded maximum recursion depth", None, expr)
+
+        return program
+
+    def classify(self, expr: str) -> "StaticExpression":
+        """
+        What `expr` depends on, and its value if it is a constant. Worked out once per
+        expression text, so editing a stored expression classifies the new text afresh and
+        every later evaluation of it only looks it up.
+        """
+        static = self._static.get(expr)
+
+        if static is None:
+            static = self._static[expr] = StaticExpression.analyze(self.parse(expr, count=False), expr, self)
+
+        return static
+
+    def evaluate(self, expr: str, context: Optional[AutomationContext] = None, **extra_vars) -> Any:
+        return evaluate_expression(expr, context, cache=self, **extra_vars)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._programs.clear()
+        self._static.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+
+        return {
+            "size": len(self._entries),
+            "compiled": len(self._programs),
+            "folded": sum(static.folded for static in self._static.values()),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0
+        }
+
+
+# Shared by evaluate_expression and the eval_* helpers
+expression_cache = ExpressionCache()
+
+
 class StewardEvaluator(ast.NodeVisitor):    
-    def __init__(self, config: Optional[StewardConfig] = None, builtins: Optional[Dict[str, Any]] = None):
+    # Supported operators; ast.Pow goes through _safe_pow for the configured limits
+    operators = {**BINARY_OPERATORS, **UNARY_OPERATORS}
+
+    # Comparison operators
+    comp_operators = COMPARISON_OPERATORS
+
+    # Boolean operators
+    bool_operators = {
+        ast.And: all,
+        ast.Or: any,
+    }
+
+    def __init__(self, config: Optional[StewardConfig] = None, builtins: Optional[Mapping[str, Any]] = None, cache: Optional[ExpressionCache] = None):
         self.config = config or StewardConfig()
-        self.builtins = builtins or DEFAULT_BUILTINS.copy()
+        self.builtins = builtins or DEFAULT_BUILTINS
+        self.cache = cache if cache is not None else expression_cache
         self.statement_count = 0
         self.loop_count = 0
-        
-        # Supported operators
-        self.operators = {
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-            ast.FloorDiv: operator.floordiv,
-            ast.Mod: operator.mod,
-            ast.Pow: self._safe_pow,
-            ast.USub: operator.neg,
-            ast.UAdd: operator.pos,
-        }
-        
-        # Comparison operators
-        self.comp_operators = {
-            ast.Eq: operator.eq,
-            ast.NotEq: operator.ne,
-            ast.Lt: operator.lt,
-            ast.LtE: operator.le,
-            ast.Gt: operator.gt,
-            ast.GtE: operator.ge,
-            ast.Is: operator.is_,
-            ast.IsNot: operator.is_not,
-            ast.In: lambda x, y: x in y,
-            ast.NotIn: lambda x, y: x not in y,
-        }
-        
-        # Boolean operators
-        self.bool_operators = {
-            ast.And: all,
-            ast.Or: any,
-        }
     
     def _safe_pow(self, base, exp):
         """Safe power operation with limits"""
-        if abs(base) > self.config.max_power_base:
-            raise LimitException(
-                f"Power base {base} exceeds maximum {self.config.max_power_base}",
-                None, ""
-            )
-        if abs(exp) > self.config.max_power:
-            raise LimitException(
-                f"Power exponent {exp} exceeds maximum {self.config.max_power}",
-                None, ""
-            )
-        return base ** exp
+        return safe_pow(self.config, base, exp)
     
     def _check_statement_limit(self):
         """Check if we've exceeded the statement limit"""
@@ -274,13 +425,11 @@ class StewardEvaluator(ast.NodeVisitor):
         self.statement_count = 0
         self.loop_count = 0
         
-        try:
-            node = ast.parse(expr, mode='eval')
-        except SyntaxError as e:
-            raise InvalidExpression(f"Syntax error in expression: {e}", None, expr)
+        node = self.cache.parse(expr)
         
-        # Merge builtins and names
-        self.names = {**self.builtins, **names}
+        # Merge builtins and names; copy() goes straight to the dict behind a mappingproxy
+        self.names = self.builtins.copy()
+        self.names.update(names)
         
         try:
             return self.visit(node.body)
@@ -322,20 +471,9 @@ class StewardEvaluator(ast.NodeVisitor):
         obj = self.visit(node.value)
         attr = node.attr
         
-        # Check for disallowed prefixes
-        for prefix in self.config.disallow_prefixes:
-            if attr.startswith(prefix):
-                raise StewardValueError(
-                    f"Access to attribute '{attr}' is not allowed",
-                    node, ""
-                )
-        
-        # Check for disallowed methods
-        if attr in self.config.disallow_methods:
-            raise StewardValueError(
-                f"Access to method '{attr}' is not allowed",
-                node, ""
-            )
+        # Check for disallowed prefixes and methods
+        if error := attribute_error(self.config, attr):
+            raise StewardValueError(error, node, "")
         
         try:
             return getattr(obj, attr)
@@ -350,7 +488,7 @@ class StewardEvaluator(ast.NodeVisitor):
         
         left = self.visit(node.left)
         right = self.visit(node.right)
-        op = self.operators.get(type(node.op))
+        op = self._safe_pow if isinstance(node.op, ast.Pow) else self.operators.get(type(node.op))
         
         if op is None:
             raise InvalidExpression(
@@ -529,45 +667,218 @@ class StewardEvaluator(ast.NodeVisitor):
         )
 
 
-def evaluate_expression(
-    expr: str,
-    context: Optional[AutomationContext] = None,
-    **extra_vars
-) -> Any:
+class CompiledEvaluator(StewardEvaluator):
+    """
+    Evaluates through programs from `compiler.compile_expression`, compiled once per
+    expression and kept in the cache next to the parsed tree. Results, limits and errors
+    match the tree-walking `StewardEvaluator`, which stays as the reference implementation.
+
+    Evaluation state lives in a per-call Frame, so one instance is shared by every caller
+    and is safe to re-enter, e.g. from an expression calling `server.xp_limit(...)`.
+    """
+
+    def eval(self, expr: str, names: Optional[Dict[str, Any]] = None) -> Any:
+        program = self.cache.compile(expr)
+        frame = Frame(self.config, self.builtins)
+
+        try:
+            return program(frame, names or {})
+        except RecursionError:
+            raise LimitException("Expression exceeded maximum recursion depth", None, expr)
+        finally:
+            # Counters of the most recent evaluation, for inspection only
+            self.statement_count = frame.statements
+            self.loop_count = frame.loops
+
+
+# Shared by evaluate_expression and the eval_* helpers
+default_evaluator = CompiledEvaluator()
+
+
+EVALUATOR_BACKENDS = {
+    "tree": StewardEvaluator,
+    "compiled": CompiledEvaluator
+}
+
+
+# Model type -> Safe* wrapper (None for values passed through as they are), filled in
+# per type on first sight; the models import this module so they can't be imported here
+_wrappers: Dict[type, Optional[type]] = {}
+
+
+def _find_wrapper(cls: type) -> Optional[type]:
     from Steward.models.objects.character import Character
     from Steward.models.objects.player import Player
     from Steward.models.objects.servers import Server
     from Steward.models.objects.npc import NPC
     from Steward.models.objects.log import StewardLog
-    
-    evaluator = StewardEvaluator()
-    
+
+    for model, wrapper in (
+        (Character, SafeCharacter),
+        (Player, SafePlayer),
+        (Server, SafeServer),
+        (NPC, SafeNPC),
+        (StewardLog, SafeLog),
+        (Patrol, SafePatrol)
+    ):
+        if issubclass(cls, model):
+            return wrapper
+
+    return None
+
+
+def context_names(
+    context: Optional[AutomationContext],
+    wrapped: Optional[Dict[int, Any]] = None,
+    only: Optional[frozenset[str]] = None
+) -> Dict[str, Any]:
+    """
+    The public attributes of `context`, with models wrapped in their Safe* objects.
+    Pass the same `wrapped` dict for several contexts to wrap each shared object once,
+    and `only` to skip attributes the expression never reads.
+    """
     names = {}
-    if context:
-        context_dict = {}
-        for key, value in context.__dict__.items():
-            if not key.startswith('_'):
-                context_dict[key] = value
-        
-        # Wrap all objects
-        for key, value in context_dict.items():
-            if value is None:
-                names[key] = None
-            elif isinstance(value, Character):
-                names[key] = SafeCharacter(value)
-            elif isinstance(value, Player):
-                names[key] = SafePlayer(value)
-            elif isinstance(value, Server):
-                names[key] = SafeServer(value)
-            elif isinstance(value, NPC):
-                names[key] = SafeNPC(value)
-            elif isinstance(value, StewardLog):
-                names[key] = SafeLog(value)
-            elif isinstance(value, Patrol):
-                names[key] = SafePatrol(value)
-            else:
-                names[key] = value
-    
+
+    if not context:
+        return names
+
+    attributes = context.__dict__
+    items = attributes.items() if only is None else ((key, attributes[key]) for key in only if key in attributes)
+
+    for key, value in items:
+        if key.startswith('_'):
+            continue
+
+        if value is not None:
+            wrapper = _wrappers.get(type(value), _MISSING)
+
+            if wrapper is _MISSING:
+                wrapper = _wrappers[type(value)] = _find_wrapper(type(value))
+
+            if wrapper:
+                if wrapped is None:
+                    value = wrapper(value)
+                elif (safe := wrapped.get(id(value))) is not None:
+                    value = safe
+                else:
+                    value = wrapped[id(value)] = wrapper(value)
+
+        names[key] = value
+
+    return names
+
+
+def _names_read(tree: ast.Expression) -> frozenset[str]:
+    """
+    Every name the expression can look up. Comprehension targets are included too, which
+    only errs towards treating it as context dependent.
+    """
+    return frozenset(node.id for node in ast.walk(tree) if isinstance(node, ast.Name))
+
+
+def _reads_varying_names(read: frozenset[str], contexts: list, extra_vars: Dict[str, Any]) -> bool:
+    """
+    Whether an expression reading `read` can evaluate differently across `contexts`: it reads
+    a context attribute that isn't the same object in all of them, or calls an impure builtin.
+    """
+    if read & IMPURE_BUILTINS:
+        return True
+
+    first = contexts[0].__dict__ if contexts[0] else {}
+
+    for context in contexts[1:]:
+        attributes = context.__dict__ if context else {}
+
+        for name in read:
+            if name in extra_vars or name.startswith('_'):
+                continue
+
+            if attributes.get(name, _MISSING) is not first.get(name, _MISSING):
+                return True
+
+    return False
+
+
+def evaluate_many(
+    expr: str,
+    contexts: Iterable[Optional[AutomationContext]],
+    return_exceptions: bool = False,
+    cache: Optional[ExpressionCache] = None,
+    **extra_vars
+) -> list[Any]:
+    """
+    `evaluate_expression(expr, context, **extra_vars)` for every context, in order.
+    The expression is parsed and compiled once and each model shared between contexts is
+    wrapped once. If nothing it reads differs between contexts it is evaluated once, and an
+    immutable result (or error) stands for all of them; anything else, such as a list, is
+    evaluated per context so callers never share one mutable object.
+
+    Like asyncio.gather, the first error is raised unless `return_exceptions` is set, in
+    which case exceptions are returned in place of the failed results.
+    """
+    contexts = list(contexts)
+    expr = str(expr)
+
+    if not contexts:
+        return []
+
+    evaluator = get_evaluator(cache)
+
+    try:
+        read = _names_read(evaluator.cache.parse(expr, count=False))
+    except InvalidExpression as e:
+        if not return_exceptions:
+            raise
+        return [e] * len(contexts)
+
+    varying = _reads_varying_names(read, contexts, extra_vars)
+    results = []
+    wrapped: Dict[int, Any] = {}
+
+    for context in contexts:
+        names = context_names(context, wrapped, read)
+        names.update(extra_vars)
+
+        try:
+            result = evaluator.eval(expr, names)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            result = e
+
+        results.append(result)
+
+        if not varying:
+            if isinstance(result, FOLDABLE_TYPES + (Exception,)):
+                return results * len(contexts)
+
+            varying = True
+
+    return results
+
+
+def get_evaluator(cache: Optional[ExpressionCache] = None) -> StewardEvaluator:
+    if EXPRESSION_BACKEND == "compiled" and cache is None:
+        return default_evaluator
+
+    # The tree-walker keeps evaluation state on the instance, so never share one
+    return EVALUATOR_BACKENDS[EXPRESSION_BACKEND](cache=cache)
+
+
+def evaluate_expression(
+    expr: str,
+    context: Optional[AutomationContext] = None,
+    cache: Optional[ExpressionCache] = None,
+    **extra_vars
+) -> Any:
+    expr = str(expr)
+    static = (cache if cache is not None else expression_cache).classify(expr)
+
+    # Constants were evaluated when first classified
+    if static.folded and not static.shadowed(context, extra_vars):
+        return static.value
+
+    names = context_names(context)
     names.update(extra_vars)
-    
-    return evaluator.eval(str(expr), names )
\ No newline at end of file
+
+    return get_evaluator(cache).eval(expr, names)
@@ -3,22 +3,15 @@ Utility functions for common expression evaluation patterns.
 This module provides convenience wrappers for typical use cases.
 """
 
-from typing import Any, Optional, Dict
+from typing import Any, Iterable, Optional, Dict
 from Steward.models.automation.context import AutomationContext
-from Steward.models.automation.evaluators import evaluate_expression, StewardEvaluator
+from Steward.models.automation.evaluators import evaluate_expression, evaluate_many, expression_cache, get_evaluator, ExpressionCache, StewardEvaluator
 from Steward.models.automation.exceptions import StewardAutomationException
 
 
-# Global evaluator instance for reuse
-_default_evaluator = None
-
-
 def get_default_evaluator() -> StewardEvaluator:
-    """Get or create the default evaluator instance."""
-    global _default_evaluator
-    if _default_evaluator is None:
-        _default_evaluator = StewardEvaluator()
-    return _default_evaluator
+    """Get the shared evaluator instance."""
+    return get_evaluator()
 
 
 def eval_with_character(expr: str, character, **extra_vars) -> Any:
@@ -68,6 +61,23 @@ def eval_bool(expr: str, context: AutomationContext = None, default: bool = Fals
         return default
 
 
+def eval_bool_many(expr: str, contexts: Iterable[AutomationContext], default: bool = False, **extra_vars) -> list[bool]:
+    """`eval_bool` for each context, evaluated together through `evaluate_many`."""
+    results = []
+
+    for result in evaluate_many(expr, contexts, return_exceptions=True, **extra_vars):
+        if result is None or isinstance(result, Exception):
+            results.append(default)
+            continue
+
+        try:
+            results.append(bool(result))
+        except Exception:
+            results.append(default)
+
+    return results
+
+
 def validate_expression(expr: str, test_context: Optional[Dict[str, Any]] = None) -> tuple[bool, Optional[str]]:
     # First, try to parse it
     import ast
@@ -118,29 +128,3 @@ def safe_evaluate(
         return True, result
     except StewardAutomationException:
         return False, default
-
-
-class ExpressionCache:
-    """
-    Cache for compiled expressions to improve performance.
-    Useful when evaluating the same expressions repeatedly.
-    """
-    
-    def __init__(self, max_size: int = 100):
-        self.cache: Dict[str, Any] = {}
-        self.max_size = max_size
-        self.evaluator = StewardEvaluator()
-    
-    def evaluate(self, expr: str, context: AutomationContext = None, **extra_vars) -> Any:
-        """
-        Evaluate an expression, using cached AST if available.
-        
-        Note: This caches the parsed AST, but variables are still evaluated fresh each time.
-        """
-        # For now, just use the regular evaluator
-        # A full implementation would cache the compiled AST nodes
-        return evaluate_expression(expr, context, **extra_vars)
-    
-    def clear(self):
-        """Clear the cache."""
-        self.cache.clear()
@@ -7,7 +7,9 @@ from marshmallow import Schema, fields, post_load
 from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncEngine
 from Steward.models import metadata
+from Steward.utils.cacheUtils import publish_invalidation
 from Steward.utils.dbUtils import execute_query
+from Steward.utils.rowUtils import RowMapper
 
 
 class Activity:
@@ -44,6 +46,8 @@ class Activity:
         sa.Index("idx_activity", "guild_id", "name")
     )
 
+    from_row = RowMapper()
+
     class ActivitySchema(Schema):
         db: AsyncEngine
 
@@ -102,7 +106,9 @@ class Activity:
 
         row = await execute_query(self._db, query)
 
-        return Activity.ActivitySchema(self._db).load(dict(row._mapping))
+        await publish_invalidation(self._db, "server", self.guild_id)
+
+        return Activity.from_row(self._db, row)
     
     @staticmethod
     async def fetch(db: AsyncEngine, activity_id: Union[uuid.UUID, str], active_only: bool = True) -> "Activity":
@@ -124,12 +130,12 @@ class Activity:
         if not row:
             return None
         
-        activity = Activity.ActivitySchema(db).load(dict(row._mapping))
+        activity = Activity.from_row(db, row)
 
         return activity
     
     @staticmethod
-    async def fetch_by_guild(db: AsyncEngine, guild_id: int, active_only: bool = True) -> list["Activity"]:
+    async def fetch_by_guild(db: AsyncEngine, guild_id: int, active_only: bool = True, replica: bool = False) -> list["Activity"]:
         """Fetch all activities for a guild - optimized for autocomplete"""
         from Steward.utils.dbUtils import QueryResultType
         
@@ -140,9 +146,9 @@ class Activity:
         if active_only:
             query = query.where(Activity.activity_table.c.active == True)
         
-        rows = await execute_query(db, query, QueryResultType.multiple)
+        rows = await execute_query(db, query, QueryResultType.multiple, replica=replica)
         
         if not rows:
             return []
         
-        return [Activity.ActivitySchema(db).load(dict(row._mapping)) for row in rows]
\ No newline at end of file
+        return Activity.from_row.all(db, rows)
\ No newline at end of file
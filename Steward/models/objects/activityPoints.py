@@ -4,11 +4,18 @@ from marshmallow import Schema, fields, post_load
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncEngine
 from Steward.models import metadata
-from Steward.utils.dbUtils import execute_query
+from Steward.models.objects.enum import QueryResultType
+from Steward.utils.cacheUtils import publish_invalidation, publish_invalidations
+from Steward.utils.dbUtils import bulk_upsert, db_session, execute_query
+from Steward.utils.rowUtils import RowMapper
 
 # TODO: CRUD operations
 
 class ActivityPoints:
+    __slots__ = (
+        "_db", "guild_id", "level", "points", "xp_expr", "currenct_expr"
+    )
+
     def __init__(self, db: AsyncEngine, **kwargs):
         self._db = db
 
@@ -29,6 +36,8 @@ class ActivityPoints:
         sa.PrimaryKeyConstraint("guild_id", "level")
     )
 
+    from_row = RowMapper()
+
     class ActivityPointsSchema(Schema):
         db: AsyncEngine
 
@@ -59,7 +68,8 @@ class ActivityPoints:
             )
         )
 
-        await execute_query(self._db, query)
+        await execute_query(self._db, query, QueryResultType.none)
+        await publish_invalidation(self._db, "server", self.guild_id)
 
     async def upsert(self) -> "ActivityPoints":
         update_dict = {
@@ -85,5 +95,26 @@ class ActivityPoints:
         )
 
         row = await execute_query(self._db, query)
+        await publish_invalidation(self._db, "server", self.guild_id)
+
+        return ActivityPoints.from_row(self._db, row)
+
+    @staticmethod
+    async def bulk_upsert(db: AsyncEngine, activity_points: list["ActivityPoints"]) -> list["ActivityPoints"]:
+        values = [
+            {
+                "guild_id": ap.guild_id,
+                "level": ap.level,
+                "points": ap.points,
+                "xp_expr": ap.xp_expr,
+                "currency_expr": ap.currenct_expr
+            }
+            for ap in activity_points
+        ]
+
+        async with db_session(db):
+            rows = await bulk_upsert(db, ActivityPoints.activity_points_table, values, ["guild_id", "level"])
+            await publish_invalidations(db, "server", [(ap.guild_id, None) for ap in activity_points])
+
+        return ActivityPoints.from_row.all(db, rows)
 
-        return ActivityPoints.ActivityPointsSchema(self._db).load(dict(row._mapping))
\ No newline at end of file
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+import asyncio
 import random
 from typing import TYPE_CHECKING, Optional, Union
 import sqlalchemy as sa
@@ -10,7 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from Steward.models.objects.enum import LogEvent, QueryResultType, RuleTrigger
 
 from .. import metadata
-from ...utils.dbUtils import execute_query
+from ...utils.dbUtils import db_session, execute_query
+from ...utils.rowUtils import RowMapper
 
 if TYPE_CHECKING:
     from .character import Character
@@ -43,8 +45,11 @@ class Item:
         sa.Column("max_qty", sa.Integer, nullable=True),
         sa.Column("min_qty", sa.Integer, nullable=True),
         sa.Column("min_bid", sa.Integer, nullable=True),
+        sa.Index("idx_items_house", "house_id")
     )
 
+    from_row = RowMapper()
+
     class ItemSchema(Schema):
         db: AsyncEngine
 
@@ -114,7 +119,7 @@ class Item:
         if not result:
             return self
 
-        return Item.ItemSchema(self._db).load(dict(result._mapping))
+        return Item.from_row(self._db, result)
 
     @staticmethod
     async def fetch(db: AsyncEngine, item_id: Union[uuid.UUID, str]) -> Optional["Item"]:
@@ -131,10 +136,10 @@ class Item:
         if not row:
             return None
 
-        return Item.ItemSchema(db).load(dict(row._mapping))
+        return Item.from_row(db, row)
 
     @staticmethod
-    async def fetch_by_house(db: AsyncEngine, house_id: Union[uuid.UUID, str]) -> list["Item"]:
+    async def fetch_by_house(db: AsyncEngine, house_id: Union[uuid.UUID, str], replica: bool = False) -> list["Item"]:
         if isinstance(house_id, str):
             house_id = uuid.UUID(house_id)
 
@@ -144,12 +149,12 @@ class Item:
             .order_by(Item.item_table.c.name)
         )
 
-        rows = await execute_query(db, query, QueryResultType.multiple)
+        rows = await execute_query(db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             return []
 
-        return [Item.ItemSchema(db).load(dict(row._mapping)) for row in rows]
+        return Item.from_row.all(db, rows)
 
 class Shelf:
     def __init__(self, db: AsyncEngine, **kwargs):
@@ -170,9 +175,12 @@ class Shelf:
         sa.Column("house_id", sa.UUID, sa.ForeignKey("ref_auction_houses.id"), nullable=False),
         sa.Column("priority", sa.Integer, nullable=False, default=0),
         sa.Column("notes", sa.String, nullable=True),
-        sa.Column("max_qty", sa.Integer, nullable=False, default=1)
+        sa.Column("max_qty", sa.Integer, nullable=False, default=1),
+        sa.Index("idx_shelves_house_priority", "house_id", "priority")
     )
 
+    from_row = RowMapper()
+
     class ShelfSchema(Schema):
         db: AsyncEngine
 
@@ -234,7 +242,7 @@ class Shelf:
         if not result:
             return self
 
-        return Shelf.ShelfSchema(self._db).load(dict(result._mapping))
+        return Shelf.from_row(self._db, result)
 
     @staticmethod
     async def fetch(db: AsyncEngine, shelf_id: Union[uuid.UUID, str]) -> Optional["Shelf"]:
@@ -251,10 +259,10 @@ class Shelf:
         if not row:
             return None
 
-        return Shelf.ShelfSchema(db).load(dict(row._mapping))
+        return Shelf.from_row(db, row)
 
     @staticmethod
-    async def fetch_by_market(db: AsyncEngine, house_id: Union[uuid.UUID, str]) -> list["Shelf"]:
+    async def fetch_by_market(db: AsyncEngine, house_id: Union[uuid.UUID, str], replica: bool = False) -> list["Shelf"]:
         if isinstance(house_id, str):
             house_id = uuid.UUID(house_id)
 
@@ -264,12 +272,12 @@ class Shelf:
             .order_by(Shelf.shelf_table.c.priority, Shelf.shelf_table.c.id)
         )
 
-        rows = await execute_query(db, query, QueryResultType.multiple)
+        rows = await execute_query(db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             return []
 
-        return [Shelf.ShelfSchema(db).load(dict(row._mapping)) for row in rows]
+        return Shelf.from_row.all(db, rows)
 
     async def load_items(self) -> list["StockItem"]:
         if not self.id:
@@ -281,6 +289,10 @@ class Shelf:
         return items
 
 class StockItem:
+    __slots__ = (
+        "_db", "id", "item_id", "shelf_id", "bids", "auction_start", "item", "shelf"
+    )
+
     def __init__(self, db: AsyncEngine, **kwargs):
         self._db = db
 
@@ -299,9 +311,12 @@ class StockItem:
         sa.Column("id", sa.UUID, primary_key=True, default=uuid.uuid4),
         sa.Column("item_id", sa.UUID, sa.ForeignKey("ref_items.id"), nullable=False),
         sa.Column("shelf_id", sa.UUID, sa.ForeignKey("ref_shelves.id"), nullable=False),
-        sa.Column("auction_start", sa.TIMESTAMP(timezone=True), nullable=True)
+        sa.Column("auction_start", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Index("idx_stock_items_shelf", "shelf_id")
     )
 
+    from_row = RowMapper()
+
     class InventoryItemSchema(Schema):
         db: AsyncEngine
 
@@ -323,10 +338,12 @@ class StockItem:
         metadata,
         sa.Column("inventory_id", sa.UUID, sa.ForeignKey("ref_stock_items.id"), primary_key=True),
         sa.Column("character_id", sa.UUID, sa.ForeignKey("characters.id"), primary_key=True),
-        sa.Column("bid", sa.Integer, nullable=False)
-
+        sa.Column("bid", sa.Integer, nullable=False),
+        sa.Index("idx_bids_inventory_bid", "inventory_id", "bid")
     )
 
+    _bid_data = RowMapper(dict)
+
     class ItemBid(Schema):
         inventory_id = fields.UUID(required=True)
         character_id = fields.UUID(required=True)
@@ -344,13 +361,15 @@ class StockItem:
             self.item_bids.delete()
             .where(self.item_bids.c.inventory_id == self.id)
         )
-        await execute_query(self._db, bid_query, QueryResultType.none)
 
         inv_query = (
             self.inventory_item_table.delete()
             .where(self.inventory_item_table.c.id == self.id)
         )
-        await execute_query(self._db, inv_query, QueryResultType.none)
+
+        async with db_session(self._db):
+            await execute_query(self._db, bid_query, QueryResultType.none)
+            await execute_query(self._db, inv_query, QueryResultType.none)
 
     async def upsert(self) -> "StockItem":
         update_dict = {
@@ -378,7 +397,7 @@ class StockItem:
         if not row:
             return self
 
-        inv_item = StockItem.InventoryItemSchema(self._db).load(dict(row._mapping))
+        inv_item = StockItem.from_row(self._db, row)
 
         if self.bids is not None:
             inv_item.bids = self.bids
@@ -410,16 +429,17 @@ class StockItem:
             self.auction_start = None
             return
 
-        normalized = []
-        hydrated: dict["Character", int] = {}
-        for character_or_id, bid in bids.items():
+        async def resolve(character_or_id) -> Optional["Character"]:
             if hasattr(character_or_id, "id"):
-                character = character_or_id
-                character_id = character.id
-            else:
-                character_id = uuid.UUID(character_or_id) if isinstance(character_or_id, str) else character_or_id
-                character = await Character.fetch(self._db, character_id, active_only=False)
+                return character_or_id
+
+            return await Character.fetch(self._db, character_or_id, active_only=False)
 
+        characters = await asyncio.gather(*[resolve(character_or_id) for character_or_id in bids])
+
+        normalized = []
+        hydrated: dict["Character", int] = {}
+        for character, bid in zip(characters, bids.values()):
             if not character:
                 continue
 
@@ -449,7 +469,7 @@ class StockItem:
 
         self.bids = hydrated
 
-    async def load_bids(self) -> dict["Character", int]:
+    async def load_bids(self, replica: bool = False) -> dict["Character", int]:
         from .character import Character
 
         if not self.id:
@@ -462,18 +482,21 @@ class StockItem:
             .order_by(self.item_bids.c.bid.desc())
         )
 
-        rows = await execute_query(self._db, query, QueryResultType.multiple)
+        rows = await execute_query(self._db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             self.bids = {}
             return self.bids
 
+        data = [self._bid_data(row) for row in rows]
+        characters = await asyncio.gather(
+            *[Character.fetch(self._db, bid["character_id"], active_only=False) for bid in data]
+        )
+
         bids: dict["Character", int] = {}
-        for row in rows:
-            data = self.ItemBid().load(dict(row._mapping))
-            character = await Character.fetch(self._db, data["character_id"], active_only=False)
+        for bid, character in zip(data, characters):
             if character:
-                bids[character] = data["bid"]
+                bids[character] = bid["bid"]
 
         self.bids = bids
         return bids
@@ -493,7 +516,7 @@ class StockItem:
         if not row:
             return None
 
-        stock_item = StockItem.InventoryItemSchema(db).load(dict(row._mapping))
+        stock_item = StockItem.from_row(db, row)
 
         if load_item:
             stock_item.item = await Item.fetch(db, stock_item.item_id)
@@ -504,7 +527,7 @@ class StockItem:
         return stock_item
 
     @staticmethod
-    async def fetch_by_market(db: AsyncEngine, house_id: Union[uuid.UUID, str], load_bids: bool = True) -> list["StockItem"]:
+    async def fetch_by_market(db: AsyncEngine, house_id: Union[uuid.UUID, str], load_bids: bool = True, replica: bool = False) -> list["StockItem"]:
         if isinstance(house_id, str):
             house_id = uuid.UUID(house_id)
 
@@ -516,16 +539,16 @@ class StockItem:
             .order_by(Shelf.shelf_table.c.priority, StockItem.inventory_item_table.c.auction_start)
         )
 
-        rows = await execute_query(db, query, QueryResultType.multiple)
+        rows = await execute_query(db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             return []
 
-        items = [StockItem.InventoryItemSchema(db).load(dict(row._mapping)) for row in rows]
+        items = StockItem.from_row.all(db, rows)
 
         if load_bids:
             for item in items:
-                await item.load_bids()
+                await item.load_bids(replica=replica)
 
         return items
 
@@ -560,7 +583,8 @@ class AuctionHouse:
         sa.Column("min_bid_percent", sa.DECIMAL(), nullable=True),
         sa.Column("auction_length", sa.DECIMAL(), nullable=True),
         sa.Column("reroll_interval", sa.DECIMAL(), nullable=True),
-        sa.Column("action_log_activity_name", sa.String(), nullable=True)
+        sa.Column("action_log_activity_name", sa.String(), nullable=True),
+        sa.Index("idx_auction_houses_guild", "guild_id")
     )
 
     @property
@@ -574,6 +598,9 @@ class AuctionHouse:
             return None
         return guild.get_channel(self.channel_id)
     
+    # Numeric columns come back as Decimal; the schema always handed out floats
+    from_row = RowMapper(converters={"min_bid_percent": float, "auction_length": float, "reroll_interval": float})
+
     class AuctionHouseSchema(Schema):
         bot: "StewardBot"
 
@@ -638,7 +665,7 @@ class AuctionHouse:
         if not row:
             return self
 
-        return self.AuctionHouseSchema(self._bot).load(dict(row._mapping))
+        return self.from_row(self._bot, row)
 
     @staticmethod
     async def fetch(bot: "StewardBot", guild_id: int, load_related: bool = True) -> Union["AuctionHouse", None]:
@@ -654,7 +681,7 @@ class AuctionHouse:
         if not row:
             return None
 
-        market = AuctionHouse.AuctionHouseSchema(bot).load(dict(row._mapping))
+        market = AuctionHouse.from_row(bot, row)
 
         if load_related:
             await AuctionHouse._load_related(bot, market)
@@ -676,7 +703,7 @@ class AuctionHouse:
         if not row:
             return None
 
-        market = AuctionHouse.AuctionHouseSchema(bot).load(dict(row._mapping))
+        market = AuctionHouse.from_row(bot, row)
 
         if load_related:
             await AuctionHouse._load_related(bot, market)
@@ -684,30 +711,30 @@ class AuctionHouse:
         return market
 
     @staticmethod
-    async def fetch_all(bot: "StewardBot", load_related: bool = True) -> list["AuctionHouse"]:
+    async def fetch_all(bot: "StewardBot", load_related: bool = True, replica: bool = False) -> list["AuctionHouse"]:
         query = (
             AuctionHouse.market_table.select()
             .order_by(AuctionHouse.market_table.c.name)
         )
 
-        rows = await execute_query(bot.db, query, QueryResultType.multiple)
+        rows = await execute_query(bot.db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             return []
 
-        markets = [AuctionHouse.AuctionHouseSchema(bot).load(dict(row._mapping)) for row in rows]
+        markets = AuctionHouse.from_row.all(bot, rows)
 
         if load_related:
             for market in markets:
-                await AuctionHouse._load_related(bot, market)
+                await AuctionHouse._load_related(bot, market, replica=replica)
 
         return markets
 
     @staticmethod
-    async def _load_related(bot: "StewardBot", market: "AuctionHouse"):
-        market.items = await Item.fetch_by_house(bot.db, market.id)
-        market.shelves = await Shelf.fetch_by_market(bot.db, market.id)
-        market.inventory = await StockItem.fetch_by_market(bot.db, market.id, load_bids=True)
+    async def _load_related(bot: "StewardBot", market: "AuctionHouse", replica: bool = False):
+        market.items = await Item.fetch_by_house(bot.db, market.id, replica=replica)
+        market.shelves = await Shelf.fetch_by_market(bot.db, market.id, replica=replica)
+        market.inventory = await StockItem.fetch_by_market(bot.db, market.id, load_bids=True, replica=replica)
 
         items_by_id = {item.id: item for item in market.items}
         shelves_by_id = {shelf.id: shelf for shelf in market.shelves}
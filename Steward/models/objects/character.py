@@ -7,10 +7,12 @@ from marshmallow import Schema, fields, post_load
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-from Steward.models.objects.enum import LogEvent
+from Steward.models.objects.enum import LogEvent, QueryResultType
 
 from ...models import metadata
-from ...utils.dbUtils import execute_query
+from ...utils.cacheUtils import publish_invalidation, publish_invalidations
+from ...utils.dbUtils import BatchLoader, after_commit, after_rollback, bulk_upsert, db_session, execute_query
+from ...utils.rowUtils import RowMapper, quantize
 
 if TYPE_CHECKING:
     from .player import Player
@@ -20,6 +22,12 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 class Character:
+    __slots__ = (
+        "_db", "id", "name", "level", "species_str", "class_str", "guild_id", "player_id",
+        "active", "primary_character", "channels", "avatar_url", "nickname", "currency",
+        "activity_points", "xp", "limited_xp", "limited_currency"
+    )
+
     def __init__(self, db: AsyncEngine, **kwargs):
         self._db = db
 
@@ -61,9 +69,11 @@ class Character:
         sa.Column("xp", sa.Integer, nullable=False, default=0),
         sa.Column("limited_xp", sa.Integer, nullable=False, default=0),
         sa.Column("limited_currency", sa.Integer, nullable=False, default=0),
-        sa.Index("idx_guild_player", "guild_id", "player_id")
+        sa.Index("idx_characters_guild_player_active", "guild_id", "player_id", "active")
     )
 
+    from_row = RowMapper(converters={"currency": quantize(2)})
+
     class CharacterSchema(Schema):
         db: AsyncEngine
         
@@ -96,33 +106,42 @@ class Character:
             return character
     
     @staticmethod
-    async def fetch(db: AsyncEngine, char_id: Union[uuid.UUID, str], active_only: bool = True) -> "Character":
-        if isinstance(char_id, str):
-            char_id = uuid.UUID(char_id)
-
+    async def _fetch_rows(db: AsyncEngine, char_ids: list[uuid.UUID]) -> dict[uuid.UUID, sa.Row]:
         query = (
             Character.characters_table.select()
-            .where(Character.characters_table.c.id == char_id)
+            .where(Character.characters_table.c.id.in_(char_ids))
         )
 
-        if active_only:
-            query.where(
-                Character.characters_table.c.active == True
-            )
+        rows = await execute_query(db, query, QueryResultType.multiple)
+
+        return {row.id: row for row in rows}
 
-        row = await execute_query(db, query)
+    # Coalesces concurrent fetch() calls (e.g. under asyncio.gather) into one IN (...) query
+    _loader = BatchLoader(_fetch_rows)
+
+    @staticmethod
+    async def fetch(db: AsyncEngine, char_id: Union[uuid.UUID, str], active_only: bool = True) -> "Character":
+        if char_id is None:
+            return None
+
+        if isinstance(char_id, str):
+            char_id = uuid.UUID(char_id)
+
+        # NB: active_only has never filtered here (the old `query.where(...)` result was discarded);
+        # callers rely on getting inactive characters back, so batching keeps that behaviour.
+        row = await Character._loader.load(db, char_id)
 
         if not row:
             return None
         
-        character: Character = Character.CharacterSchema(db).load(dict(row._mapping))
+        character: Character = Character.from_row(db, row)
 
         return character
         
 
 
-    async def upsert(self) -> "Character":
-        update_dict = {
+    def _update_dict(self) -> dict:
+        return {
             "name": self.name,
             "level": self.level,
             "species_str": self.species_str,
@@ -139,6 +158,9 @@ class Character:
             "avatar_url": self.avatar_url
         }
 
+    async def upsert(self) -> "Character":
+        update_dict = self._update_dict()
+
         insert_dict = {
             "guild_id": self.guild_id,
             "player_id": self.player_id,
@@ -158,11 +180,73 @@ class Character:
                 .values(**insert_dict)
                 .returning(Character.characters_table)
             )
-        row = await execute_query(self._db, query)
-        character: Character = Character.CharacterSchema(self._db).load(dict(row._mapping))
+        # Callers edit the cached instance before saving; if the write never lands, drop its
+        # player so the next get_or_create reloads what is actually stored
+        try:
+            row = await execute_query(self._db, query)
+        except Exception:
+            Character._evict_player(self)
+            raise
+
+        character: Character = Character.from_row(self._db, row)
+
+        after_rollback(self._db, lambda: Character._evict_player(character))
+        await publish_invalidation(self._db, "player", character.guild_id, character.player_id, local=False)
+        after_commit(self._db, lambda: Character._cache_on_player(character))
 
         return character  
     
+    @staticmethod
+    async def bulk_upsert(db: AsyncEngine, characters: list["Character"]) -> list["Character"]:
+        """
+        Persist many characters with one statement per chunk and return the saved rows.
+        All chunks share one transaction, so a failing row rolls back the whole call.
+        """
+        values = [
+            {
+                "id": character.id if character.id is not None else uuid.uuid4(),
+                "guild_id": character.guild_id,
+                "player_id": character.player_id,
+                **character._update_dict()
+            }
+            for character in characters
+        ]
+
+        update_columns = [c for c in values[0] if c not in ("id", "guild_id", "player_id")] if values else None
+
+        async with db_session(db):
+            # Registered before the write, so it also covers a failure inside this call
+            def evict_all():
+                for character in characters:
+                    Character._evict_player(character)
+
+            after_rollback(db, evict_all)
+
+            rows = await bulk_upsert(db, Character.characters_table, values, ["id"], update_columns)
+            saved = Character.from_row.all(db, rows)
+
+            await publish_invalidations(db, "player", [(character.guild_id, character.player_id) for character in saved], local=False)
+
+            def cache_all():
+                for character in saved:
+                    Character._cache_on_player(character)
+
+            after_commit(db, cache_all)
+
+        return saved
+
+    @staticmethod
+    def _cache_on_player(character: "Character") -> None:
+        from .player import Player
+
+        Player.cache_character(character)
+
+    @staticmethod
+    def _evict_player(character: "Character") -> None:
+        from .player import Player
+
+        Player.invalidate(character.guild_id, character.player_id)
+
     @property
     def mention(self):          
         return self.nickname if self.nickname else self.name
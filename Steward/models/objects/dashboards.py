@@ -74,7 +74,9 @@ class CategoryDashboard:
         sa.Column("channel_id", sa.BigInteger, nullable=False),
         sa.Column("category_id", sa.BigInteger, nullable=False),
         sa.Column("message_id", sa.BigInteger, nullable=False),
-        sa.Column("excluded_channel_ids", sa.ARRAY(sa.BigInteger), nullable=False, default=[])
+        sa.Column("excluded_channel_ids", sa.ARRAY(sa.BigInteger), nullable=False, default=[]),
+        sa.Index("idx_category_dashboards_category", "category_id"),
+        sa.Index("idx_category_dashboards_guild", "guild_id")
     )
 
     class CategoryDashboardSchema(Schema):
@@ -154,7 +156,7 @@ class CategoryDashboard:
         return dashboards
 
     @classmethod
-    async def fetch_all(cls, bot: "StewardBot", guild_id: int = None) -> list["CategoryDashboard"]:
+    async def fetch_all(cls, bot: "StewardBot", guild_id: int = None, replica: bool = False) -> list["CategoryDashboard"]:
         query = (
             cls.category_dashboard_table.select()
         )
@@ -162,7 +164,7 @@ class CategoryDashboard:
         if guild_id:
             query = query.where(cls.category_dashboard_table.c.guild_id == guild_id)
 
-        rows = await execute_query(bot.db, query, QueryResultType.multiple)
+        rows = await execute_query(bot.db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             return []
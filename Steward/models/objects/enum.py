@@ -56,4 +56,9 @@ class PatrolOutcome(StewardEnum):
     full_clear = "Full Clear"
     half_clear = "Half Clear"
     failure = "Failure"
-    incomplete = "Incomplete"
\ No newline at end of file
+    incomplete = "Incomplete"
+
+class ExpressionKind(StewardEnum):
+    constant = "Constant"
+    server = "Server"
+    context = "Character/Player"
@@ -12,7 +12,8 @@ from Steward.models.objects.enum import QueryResultType
 from Steward.models.objects.player import Player
 
 from .. import metadata
-from ...utils.dbUtils import execute_query
+from ...utils.dbUtils import after_commit, execute_query
+from ...utils.trackingUtils import tracked_messages
 
 if TYPE_CHECKING:
     from Steward.models.objects.character import Character
@@ -93,14 +94,14 @@ class FormTemplate:
         await execute_query(self._db, query, QueryResultType.none)
 
     @staticmethod
-    async def fetch_all(db: AsyncEngine, guild_id: int) -> list["FormTemplate"]:
+    async def fetch_all(db: AsyncEngine, guild_id: int, replica: bool = False) -> list["FormTemplate"]:
         query = (
             FormTemplate.application_template_table.select()
             .where(FormTemplate.application_template_table.c.guild_id == guild_id)
             .order_by(FormTemplate.application_template_table.c.name)
         )
 
-        rows = await execute_query(db, query, QueryResultType.multiple)
+        rows = await execute_query(db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             return []
@@ -159,7 +160,9 @@ class Application:
         sa.Column("status", sa.String, nullable=False, default='draft'),
         sa.Column("created_ts", sa.TIMESTAMP(timezone=timezone.utc), nullable=False),
         sa.Column("submitted_ts", sa.TIMESTAMP(timezone=timezone.utc), nullable=True),
-        sa.Column("message_id", sa.BigInteger, nullable=True)
+        sa.Column("message_id", sa.BigInteger, nullable=True),
+        sa.Index("idx_applications_draft_lookup", "guild_id", "player_id", "template_name", "status"),
+        sa.Index("idx_applications_guild_message", "guild_id", "message_id")
     )
 
     class ApplicationSchema(Schema):
@@ -285,6 +288,8 @@ class Application:
                 .returning(self.application_table)
             )
 
+        tracked_messages.add("application", self.message_id)
+
         row = await execute_query(self._db, query)
         
         if not row:
@@ -308,6 +313,7 @@ class Application:
         )
 
         await execute_query(self._db, query, QueryResultType.none)
+        after_commit(self._db, lambda: tracked_messages.discard("application", self.message_id))
 
     @staticmethod
     async def fetch_draft(
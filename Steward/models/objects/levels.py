@@ -5,9 +5,15 @@ from sqlalchemy.dialects.postgresql import insert
 from marshmallow import Schema, fields, post_load
 from Steward.models import metadata
 from Steward.models.objects.enum import QueryResultType
-from Steward.utils.dbUtils import execute_query
+from Steward.utils.cacheUtils import publish_invalidation, publish_invalidations
+from Steward.utils.dbUtils import bulk_upsert, db_session, execute_query
+from Steward.utils.rowUtils import RowMapper
 
 class Levels:
+    __slots__ = (
+        "_db", "guild_id", "level", "tier", "xp"
+    )
+
     def __init__(self, db: AsyncEngine, guild_id: int, level: int, xp: int, tier: int):
         self._db = db
 
@@ -26,6 +32,8 @@ class Levels:
         sa.PrimaryKeyConstraint("guild_id", "level")
     )
 
+    from_row = RowMapper()
+
     class LevelSchema(Schema):
         db: AsyncEngine
 
@@ -55,6 +63,7 @@ class Levels:
         )
 
         await execute_query(self._db, query, QueryResultType.none)
+        await publish_invalidation(self._db, "server", self.guild_id)
 
     async def upsert(self) -> "Levels":
         update_dict = {
@@ -79,5 +88,25 @@ class Levels:
         )
 
         row = await execute_query(self._db, query)
+        await publish_invalidation(self._db, "server", self.guild_id)
+
+        return Levels.from_row(self._db, row)
+
+    @staticmethod
+    async def bulk_upsert(db: AsyncEngine, levels: list["Levels"]) -> list["Levels"]:
+        values = [
+            {
+                "guild_id": level.guild_id,
+                "level": level.level,
+                "xp": level.xp,
+                "tier": level.tier
+            }
+            for level in levels
+        ]
+
+        async with db_session(db):
+            rows = await bulk_upsert(db, Levels.level_table, values, ["guild_id", "level"])
+            await publish_invalidations(db, "server", [(level.guild_id, None) for level in levels])
+
+        return Levels.from_row.all(db, rows)
 
-        return Levels.LevelSchema(self._db).load(dict(row._mapping))
\ No newline at end of file
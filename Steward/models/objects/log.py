@@ -1,4 +1,5 @@
 from decimal import Decimal
+import asyncio
 import uuid
 import sqlalchemy as sa
 import discord
@@ -14,7 +15,8 @@ from Steward.models.objects.activity import Activity
 from Steward.models.objects.enum import LogEvent, QueryResultType, RuleTrigger
 from Steward.models import metadata
 from Steward.models.objects.exceptions import StewardError, TransactionError
-from Steward.utils.dbUtils import execute_query
+from Steward.utils.dbUtils import db_session, execute_query
+from Steward.utils.rowUtils import RowMapper, quantize
 
 log = logging.getLogger(__name__)
 
@@ -66,6 +68,12 @@ class StewardLog:
         ... )
     """
 
+    __slots__ = (
+        "_bot", "id", "author_id", "player_id", "guild_id", "event", "character_id", "activity",
+        "currency", "xp", "notes", "invalid", "created_ts", "original_xp", "original_currency",
+        "server", "player", "author", "character", "activity_id"
+    )
+
     def __init__(self, bot: "StewardBot", **kwargs):
         self._bot = bot
 
@@ -108,10 +116,15 @@ class StewardLog:
         sa.Column("notes", sa.String, nullable=True),
         sa.Column("invalid", sa.Boolean, nullable=False, default=False),
         sa.Column("created_ts", sa.TIMESTAMP(timezone=timezone.utc), nullable=False),
-        sa.Index("idx_log_guild_player", "guild_id", "player_id"),
-        sa.Index("idx_log_guild_author", "guild_id", "author_id")
+        sa.Index("idx_log_guild_player_created", "guild_id", "player_id", "created_ts"),
+        sa.Index("idx_log_guild_created", "guild_id", "created_ts"),
+        sa.Index("idx_log_guild_author", "guild_id", "author_id"),
+        sa.Index("idx_log_character_created", "character_id", "created_ts")
     )
 
+    # Row -> constructor kwargs, as StewardLogSchema would load them
+    _row_data = RowMapper(dict, {column: quantize(2) for column in ("original_currency", "currency", "original_xp", "xp")})
+
     class StewardLogSchema(Schema):
         id = fields.UUID(required=True)
         author_id = fields.Integer()
@@ -176,7 +189,7 @@ class StewardLog:
         if not row:
             return None
         
-        data = StewardLog.StewardLogSchema().load(dict(row._mapping))
+        data = StewardLog._row_data(row)
 
         log = await StewardLog._make_log_whole(self._bot, data)
 
@@ -200,7 +213,7 @@ class StewardLog:
         if not row:
             return None
 
-        data = StewardLog.StewardLogSchema().load(dict(row._mapping))
+        data = StewardLog._row_data(row)
 
         log = await StewardLog._make_log_whole(bot, data)
 
@@ -253,6 +266,7 @@ class StewardLog:
 
         limit = kwargs.get("limit", 200)
         hydrate = kwargs.get("hydrate", True)
+        replica = kwargs.get("replica", True)
 
         query = (
             StewardLog.log_table.select()
@@ -261,7 +275,7 @@ class StewardLog:
             .limit(limit)
         )
 
-        rows = await execute_query(bot.db, query, QueryResultType.multiple)
+        rows = await execute_query(bot.db, query, QueryResultType.multiple, replica=replica)
 
         if not rows:
             return []
@@ -269,20 +283,31 @@ class StewardLog:
         if not isinstance(rows, list):
             rows = [rows]
 
+        entries = [StewardLog._row_data(row) for row in rows]
+
+        if hydrate:
+            from Steward.models.objects.character import Character
+
+            # One batched query for every log's character instead of one per log
+            characters = await asyncio.gather(
+                *[Character.fetch(bot.db, data.get("character_id")) for data in entries]
+            )
+
+            return [
+                await StewardLog._make_log_whole(bot, data, character=character)
+                for data, character in zip(entries, characters)
+            ]
+
         logs: list[StewardLog] = []
-        for row in rows:
-            data = StewardLog.StewardLogSchema().load(dict(row._mapping))
-            if hydrate:
-                logs.append(await StewardLog._make_log_whole(bot, data))
-            else:
-                log = StewardLog(bot, **data)
-                log.event = LogEvent.from_string(log.event)
-                logs.append(log)
+        for data in entries:
+            log = StewardLog(bot, **data)
+            log.event = LogEvent.from_string(log.event)
+            logs.append(log)
 
         return logs
 
     @staticmethod
-    async def _make_log_whole(bot: "StewardBot", data):
+    async def _make_log_whole(bot: "StewardBot", data, **kwargs):
         from Steward.models.objects.character import Character
         from Steward.models.objects.servers import Server
         from Steward.models.objects.player import Player
@@ -292,7 +317,12 @@ class StewardLog:
         log.server = await Server.get_or_create(bot.db, bot.get_guild(log.guild_id))
         log.player = await Player.get_or_create(bot.db, log.server.get_member(log.player_id))
         log.author = await Player.get_or_create(bot.db, log.server.get_member(log.author_id))
-        log.character = await Character.fetch(bot.db, log.character_id)
+
+        if "character" in kwargs:
+            log.character = kwargs["character"]
+        else:
+            log.character = await Character.fetch(bot.db, log.character_id)
+
         log.activity = await Activity.fetch(bot.db, log.activity_id)
         
         return log
@@ -324,7 +354,17 @@ class StewardLog:
             - Currency and XP expressions are evaluated in the automation context.
             - If the activity is limited, server-defined limits are applied.
             - Character updates are persisted before returning the log entry.
+            - All reads and writes share a single database session/transaction.
         """
+        async with db_session(bot.db):
+            log_entry = await StewardLog._create(bot, author, player, event, **kwargs)
+
+        bot.dispatch(RuleTrigger.log.name, log_entry)
+
+        return log_entry
+
+    @staticmethod
+    async def _create(bot: "StewardBot", author: Union["Player", discord.User], player: "Player", event: LogEvent, **kwargs) -> "StewardLog":
         from Steward.models.objects.servers import Server
         from Steward.models.objects.character import Character
 
@@ -440,7 +480,6 @@ class StewardLog:
             await character.upsert()
 
         log_entry = await log_entry.upsert()
-        bot.dispatch(RuleTrigger.log.name, log_entry)
 
         return log_entry      
 
@@ -9,13 +9,19 @@ from sqlalchemy.dialects.postgresql import ARRAY, insert
 from marshmallow import Schema, fields, post_load
 from Steward.models import metadata
 from Steward.models.objects.enum import QueryResultType, WebhookType
+from Steward.utils.cacheUtils import publish_invalidation
 from Steward.utils.dbUtils import execute_query
 from Steward.utils.discordUtils import dm_check, get_webhook
+from Steward.utils.rowUtils import RowMapper
 
 if TYPE_CHECKING:
     from Steward.bot import StewardBot
 
 class NPC:
+    __slots__ = (
+        "_db", "guild_id", "key", "name", "avatar_url", "roles", "adventure_id"
+    )
+
     def __init__(self, db: AsyncEngine, guild_id: int, key: str, name: str, **kwargs):
         self._db = db
 
@@ -39,6 +45,8 @@ class NPC:
         sa.PrimaryKeyConstraint("guild_id", "key")
     )
 
+    from_row = RowMapper()
+
     class NPCSchema(Schema):
         db: AsyncEngine
 
@@ -70,6 +78,7 @@ class NPC:
         )
 
         await execute_query(self._db, query, QueryResultType.none)
+        await publish_invalidation(self._db, "server", self.guild_id)
 
     async def upsert(self) -> None:
         update_dict = {
@@ -96,6 +105,7 @@ class NPC:
         )
 
         await execute_query(self._db, query, QueryResultType.none)
+        await publish_invalidation(self._db, "server", self.guild_id)
 
     async def send_message(self, ctx: discord.ApplicationContext, content: str) -> None:
         webhook = await get_webhook(ctx.channel)
@@ -148,10 +158,6 @@ class NPC:
 
         npc_rows = await execute_query(db, query, QueryResultType.multiple)
 
-        npcs = [
-            NPC.NPCSchema(db).load(dict(row._mapping)) for row in npc_rows
-        ]
-
-        return npcs
+        return NPC.from_row.all(db, npc_rows)
 
     
\ No newline at end of file
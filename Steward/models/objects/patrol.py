@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+import asyncio
 import discord
 import uuid
 import sqlalchemy as sa
@@ -10,8 +11,9 @@ from sqlalchemy.dialects.postgresql import ARRAY, insert
 from marshmallow import Schema, fields, post_load
 from Steward.models import metadata
 from Steward.models.objects.enum import QueryResultType, WebhookType
-from Steward.utils.dbUtils import execute_query
+from Steward.utils.dbUtils import after_commit, execute_query
 from Steward.utils.discordUtils import dm_check, get_webhook
+from Steward.utils.trackingUtils import tracked_messages
 
 if TYPE_CHECKING:
     from Steward.bot import StewardBot
@@ -48,6 +50,8 @@ class Patrol:
         sa.Column("notes", sa.String(), nullable=True),
         sa.Column("pinned_message_id", sa.BigInteger, nullable=True),
         sa.Column("end_ts", sa.TIMESTAMP(timezone=timezone.utc), nullable=True),
+        sa.Index("idx_patrols_channel_end", "channel_id", "end_ts"),
+        sa.Index("idx_patrols_end", "end_ts")
     )
 
     class PatrolSchema(Schema):
@@ -98,8 +102,14 @@ class Patrol:
                 .returning(self.patrol_table)
             )
 
+        if self.end_ts is None:
+            tracked_messages.add("patrol", self.pinned_message_id)
+
         result = await execute_query(self._db, query)
 
+        if self.end_ts is not None:
+            after_commit(self._db, lambda: tracked_messages.discard("patrol", self.pinned_message_id))
+
         if self.id is None and result:
             row = result[0] if isinstance(result, list) else result
             self.id = dict(row._mapping)["id"]
@@ -112,11 +122,11 @@ class Patrol:
         if not hasattr(self, "character_ids"):
             return
         
-        for char_id in getattr(self, "character_ids", []):
-            character = await Character.fetch(self._db, char_id)
+        characters = await asyncio.gather(
+            *[Character.fetch(self._db, char_id) for char_id in getattr(self, "character_ids", [])]
+        )
 
-            if character:
-                self.characters.append(character)      
+        self.characters.extend(character for character in characters if character)
 
     
     @classmethod
@@ -1,14 +1,23 @@
-from typing import TYPE_CHECKING, Union
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import TYPE_CHECKING, Optional, Union
+import asyncio
 import discord
+import logging
 import sqlalchemy as sa
 
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncEngine
 from marshmallow import Schema, fields, post_load
 from Steward.models import metadata
 
 from Steward.models.objects.enum import QueryResultType
-from Steward.utils.dbUtils import execute_query
-from Steward.utils.discordUtils import get_webhook
+from Steward.models.objects.postStats import PostStats
+from Steward.utils.cacheUtils import TTLCache, publish_invalidation, register_invalidation
+from Steward.utils.dbUtils import after_commit, after_rollback, db_session, execute_query
+from Steward.utils.discordUtils import delegate_slots, get_webhook
+from Steward.utils.rowUtils import RowMapper
+from constants import COMMAND_STATS_FLUSH_SECONDS, PLAYER_CACHE_SIZE, PLAYER_CACHE_TTL
 
 if TYPE_CHECKING:
     from Steward.models.objects.activityPoints import ActivityPoints
@@ -16,15 +25,13 @@ if TYPE_CHECKING:
     from Steward.bot import StewardApplicationContext
     from Steward.models.objects.npc import NPC
 
+log = logging.getLogger(__name__)
+
+@delegate_slots("_member", discord.Member)
 class Player(discord.Member):
     def __init__(self, db: AsyncEngine, member: discord.Member, **kwargs):
         self._db = db
-
-        for attr in member.__slots__:
-            try:
-                setattr(self, attr, getattr(member, attr))
-            except AttributeError:
-                pass
+        self._member = member
 
         self.statistics: dict[str, int]  = kwargs.get("statistics", {})
         self.campaign = kwargs.get("campaign")
@@ -42,12 +49,16 @@ class Player(discord.Member):
         metadata,
         sa.Column("id", sa.BigInteger, primary_key=True),
         sa.Column("guild_id", sa.BigInteger, sa.ForeignKey("servers.id") ,primary_key=True),
-        sa.Column("statistics", sa.JSON, nullable=False),
+        sa.Column("statistics", JSONB, nullable=False),
         sa.Column("campaign", sa.String, nullable=True),
         sa.Column("notes", sa.String, nullable=True),
-        sa.Column("staff_points", sa.Integer, nullable=False, default=0)
+        sa.Column("staff_points", sa.Integer, nullable=False, default=0),
+        sa.Index("idx_players_guild", "guild_id")
     )
 
+    # Row -> constructor kwargs, as PlayerSchema would load them
+    _row_data = RowMapper(dict)
+
     class PlayerSchema(Schema):
         id = fields.Integer(required=True)
         guild_id = fields.Integer(required=True)
@@ -75,7 +86,7 @@ class Player(discord.Member):
 
         rows = await execute_query(self._db, query, QueryResultType.multiple)
 
-        self.characters = [Character.CharacterSchema(self._db).load(dict(row._mapping)) for row in rows]
+        self.characters = Character.from_row.all(self._db, rows)
 
     @property
     def active_characters(self) -> list["Character"]:
@@ -143,6 +154,15 @@ class Player(discord.Member):
     
     @classmethod
     async def get_or_create(cls, db: AsyncEngine, member: discord.Member) -> "Player":
+        # Views pass Players back in; wrapping one (or pointing a cached Player at itself)
+        # would make every delegated attribute recurse
+        member = getattr(member, "_member", member)
+
+        if (player := cls._cache.get((member.guild.id, member.id))) and player._db is db:
+            # Database state is cached; Discord state (roles, nick, ...) always comes from the live member
+            player._member = member
+            return player
+
         query = (
             cls.player_table.select()
             .where(sa.and_(
@@ -164,14 +184,40 @@ class Player(discord.Member):
             )
             row = await execute_query(db, insert_query)
 
-        data = cls.PlayerSchema().load(dict(row._mapping))
+        data = cls._row_data(row)
         
         player = cls(db, member, **data)
         await player.load_characters()
+
+        cls._cache.set((member.guild.id, member.id), player)
         return player
 
+    # Identity map of hydrated players (and their characters) by (guild id, member id)
+    _cache: TTLCache["Player"] = TTLCache(PLAYER_CACHE_TTL, PLAYER_CACHE_SIZE)
+
+    @classmethod
+    def invalidate(cls, guild_id: int, player_id: int) -> None:
+        cls._cache.invalidate((guild_id, player_id))
+
+    @classmethod
+    def cache_character(cls, character: "Character") -> None:
+        """Write a saved character through to its cached player, if that player is cached."""
+        player = cls._cache.get((character.guild_id, character.player_id), count=False)
+
+        if not player:
+            return
+
+        for i, existing in enumerate(player.characters):
+            if existing.id == character.id:
+                player.characters[i] = character
+                break
+        else:
+            player.characters.append(character)
+
     
     async def save(self) -> None:
+        # statistics is only ever written with server-side increments
+        # (update_post_stats / CommandStatsBuffer)
         query = (
             self.player_table.update()
             .where(sa.and_(
@@ -180,7 +226,6 @@ class Player(discord.Member):
             ))
             .values(
                 {
-                    "statistics": self.statistics,
                     "campaign": getattr(self, "campaign"),
                     "notes": getattr(self, "notes"),
                     "staff_points": getattr(self, "staff_points")
@@ -189,14 +234,25 @@ class Player(discord.Member):
             .returning(self.player_table)
         )
 
-        await execute_query(self._db, query)
+        # Callers edit the cached instance before saving; if the write never lands, drop it
+        # so the next get_or_create reloads what is actually stored
+        try:
+            await execute_query(self._db, query)
+        except Exception:
+            Player.invalidate(self.guild.id, self.id)
+            raise
 
-    async def update_command_count(self, command: str) -> None:
-        self.statistics.setdefault("commands", {}).setdefault(command, 0)
+        after_rollback(self._db, lambda: Player.invalidate(self.guild.id, self.id))
+        await publish_invalidation(self._db, "player", self.guild.id, self.id, local=False)
+        after_commit(self._db, lambda: Player._cache.set((self.guild.id, self.id), self))
 
-        self.statistics["commands"][command] += 1
+    async def update_command_count(self, command: str) -> None:
+        buffer = CommandStatsBuffer.get(self._db)
 
-        await self.save()
+        if buffer:
+            buffer.add(self.guild.id, self.id, command)
+        else:
+            await CommandStatsBuffer.write(self._db, self.guild.id, self.id, Counter({command: 1}))
 
     async def update_post_stats(self, character: Union["Character", "NPC"], post: discord.Message, **kwargs) -> None:
         from .character import Character
@@ -204,8 +260,6 @@ class Player(discord.Member):
         content: str = kwargs.get("content", post.content)
         retract: bool = kwargs.get("retract", False)
 
-        current_date = post.created_at.strftime("%Y-%m-%d")
-
         # Determine key and id
         if isinstance(character, Character):
             key = "character"
@@ -214,28 +268,130 @@ class Player(discord.Member):
             key = "npc"
             id = character.key
 
-        self.statistics.setdefault(key, {}).setdefault(id, {}).setdefault(
-            current_date,
-            {"num_lines": 0, "num_words": 0, "num_characters": 0, "count": 0}
+        multiplier = -1 if retract else 1
+
+        await PostStats.increment(
+            self._db,
+            self.guild.id,
+            self.id,
+            key,
+            id,
+            post.created_at.date(),
+            lines=len(content.splitlines()) * multiplier,
+            words=len(content.split()) * multiplier,
+            chars=len(content) * multiplier,
+            count=multiplier
         )
 
-        daily_stats = self.statistics[key][id][current_date]
+    @staticmethod
+    async def increment_statistics(db: AsyncEngine, guild_id: int, player_id: int, path: list[str], deltas: dict[str, int]) -> None:
+        """
+        Add `deltas` to the counters of the object at `path` inside `statistics`, creating
+        any missing levels. Only the touched object is sent; the rest of the blob stays server-side.
+        """
+        stored = Player.player_table.c.statistics
+        empty = sa.cast("{}", JSONB)
+
+        bucket = sa.func.coalesce(stored[tuple(path)], empty)
+        value = bucket.op("||")(
+            sa.func.jsonb_build_object(
+                *chain.from_iterable(
+                    (stat, sa.func.coalesce(bucket[stat].astext.cast(sa.Integer), 0) + delta)
+                    for stat, delta in deltas.items()
+                )
+            )
+        )
 
-        
-        num_lines = len(content.splitlines())
-        num_words = len(content.split())
-        num_characters = len(content)
+        # Rebuild the path from the leaf up so missing parents are created
+        for depth in range(len(path) - 1, -1, -1):
+            parent = sa.func.coalesce(stored[tuple(path[:depth])], empty) if depth else stored
+            value = parent.op("||")(sa.func.jsonb_build_object(path[depth], value))
 
-        
-        multiplier = -1 if retract else 1
+        query = (
+            Player.player_table.update()
+            .where(sa.and_(
+                Player.player_table.c.id == player_id,
+                Player.player_table.c.guild_id == guild_id
+            ))
+            .values(statistics=value)
+        )
 
-        daily_stats["num_lines"] += num_lines * multiplier
-        daily_stats["num_words"] += num_words * multiplier
-        daily_stats["num_characters"] += num_characters * multiplier
-        daily_stats["count"] += multiplier
+        await execute_query(db, query, QueryResultType.none)
 
-        await self.save()   
-        
-            
 
-        
\ No newline at end of file
+register_invalidation("player", Player._cache, lambda guild_id, player_id: (guild_id, player_id))
+
+
+class CommandStatsBuffer:
+    """
+    Accumulates player command counters in memory and writes them every
+    `COMMAND_STATS_FLUSH_SECONDS`, with one increment statement per player.
+    """
+    _buffers: dict[AsyncEngine, "CommandStatsBuffer"] = {}
+
+    def __init__(self, db: AsyncEngine, interval: float = COMMAND_STATS_FLUSH_SECONDS):
+        self._db = db
+        self.interval = interval
+
+        self._counts: defaultdict[tuple[int, int], Counter] = defaultdict(Counter)
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get(cls, db: AsyncEngine) -> Optional["CommandStatsBuffer"]:
+        return cls._buffers.get(db)
+
+    def add(self, guild_id: int, player_id: int, command: str) -> None:
+        self._counts[(guild_id, player_id)][command] += 1
+
+    def start(self) -> None:
+        CommandStatsBuffer._buffers[self._db] = self
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        CommandStatsBuffer._buffers.pop(self._db, None)
+
+        if self._task:
+            self._task.cancel()
+
+            try:
+                # Let an interrupted flush put its counters back before the final one
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to flush command statistics")
+
+    async def flush(self) -> int:
+        if not self._counts:
+            return 0
+
+        counts, self._counts = self._counts, defaultdict(Counter)
+
+        try:
+            async with db_session(self._db):
+                for (guild_id, player_id), commands in counts.items():
+                    await CommandStatsBuffer.write(self._db, guild_id, player_id, commands)
+        except BaseException:
+            # Put them back so the next flush retries, also when cancelled mid-write
+            for key, commands in counts.items():
+                self._counts[key].update(commands)
+            raise
+
+        return len(counts)
+
+    @staticmethod
+    async def write(db: AsyncEngine, guild_id: int, player_id: int, commands: Counter) -> None:
+        await Player.increment_statistics(db, guild_id, player_id, ["commands"], commands)
@@ -0,0 +1,167 @@
+from datetime import date, timedelta
+from typing import Optional
+import sqlalchemy as sa
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from Steward.models import metadata
+from Steward.models.objects.enum import QueryResultType
+from Steward.utils.dbUtils import db_session, execute_query
+
+STAT_COLUMNS = ("lines", "words", "chars", "count")
+KEY_COLUMNS = ("guild_id", "player_id", "subject_type", "subject_id")
+
+
+def _stats_table(name: str, period_column: str) -> sa.Table:
+    return sa.Table(
+        name,
+        metadata,
+        sa.Column("guild_id", sa.BigInteger, sa.ForeignKey("servers.id"), nullable=False),
+        sa.Column("player_id", sa.BigInteger, nullable=False),
+        sa.Column("subject_type", sa.String, nullable=False),  # "character" or "npc"
+        sa.Column("subject_id", sa.String, nullable=False),  # character id or npc key
+        sa.Column(period_column, sa.Date, nullable=False),
+        sa.Column("lines", sa.Integer, nullable=False, default=0),
+        sa.Column("words", sa.Integer, nullable=False, default=0),
+        sa.Column("chars", sa.Integer, nullable=False, default=0),
+        sa.Column("count", sa.Integer, nullable=False, default=0),
+        sa.PrimaryKeyConstraint(*KEY_COLUMNS, period_column),
+        sa.Index(f"idx_{name}_guild_{period_column}", "guild_id", period_column),
+        sa.Index(f"idx_{name}_{period_column}", period_column)
+    )
+
+
+def week_start(day: date) -> date:
+    # Monday, same as Postgres date_trunc('week', ...)
+    return day - timedelta(days=day.weekday())
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+class PostStats:
+    """
+    Per-day post counters for characters and NPCs, with weekly and monthly rollups.
+    Days touched since the last rollup are tracked in memory so only those periods are recomputed.
+    """
+    _dirty_days: set[date] = set()
+
+    daily_table = _stats_table("post_stats_daily", "day")
+    weekly_table = _stats_table("post_stats_weekly", "period_start")
+    monthly_table = _stats_table("post_stats_monthly", "period_start")
+
+    @staticmethod
+    async def increment(db: AsyncEngine, guild_id: int, player_id: int, subject_type: str, subject_id: str, day: date, **deltas: int) -> None:
+        table = PostStats.daily_table
+        values = {stat: deltas.get(stat, 0) for stat in STAT_COLUMNS}
+
+        query = insert(table).values(
+            guild_id=guild_id,
+            player_id=player_id,
+            subject_type=subject_type,
+            subject_id=subject_id,
+            day=day,
+            **values
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[*KEY_COLUMNS, "day"],
+            set_={stat: table.c[stat] + query.excluded[stat] for stat in STAT_COLUMNS}
+        )
+
+        await execute_query(db, query, QueryResultType.none)
+        PostStats._dirty_days.add(day)
+
+    @staticmethod
+    async def rollup(db: AsyncEngine, days: Optional[set[date]] = None) -> int:
+        """
+        Recompute the weekly and monthly rows for every period containing one of `days`
+        (defaults to the days touched since the last rollup). Returns the number of periods rebuilt.
+        """
+        if days is None:
+            days, PostStats._dirty_days = PostStats._dirty_days, set()
+
+        if not days:
+            return 0
+
+        periods = [
+            (PostStats.weekly_table, start, start + timedelta(days=7))
+            for start in {week_start(d) for d in days}
+        ] + [
+            (PostStats.monthly_table, start, _next_month(start))
+            for start in {month_start(d) for d in days}
+        ]
+
+        try:
+            async with db_session(db):
+                for table, start, end in periods:
+                    await PostStats._rollup_period(db, table, start, end)
+        except Exception:
+            PostStats._dirty_days.update(days)
+            raise
+
+        return len(periods)
+
+    @staticmethod
+    async def _rollup_period(db: AsyncEngine, table: sa.Table, start: date, end: date) -> None:
+        daily = PostStats.daily_table
+
+        totals = (
+            sa.select(
+                *[daily.c[column] for column in KEY_COLUMNS],
+                sa.literal(start, sa.Date).label("period_start"),
+                *[sa.func.sum(daily.c[stat]).label(stat) for stat in STAT_COLUMNS]
+            )
+            .where(sa.and_(daily.c.day >= start, daily.c.day < end))
+            .group_by(*[daily.c[column] for column in KEY_COLUMNS])
+        )
+
+        query = insert(table).from_select([*KEY_COLUMNS, "period_start", *STAT_COLUMNS], totals)
+        query = query.on_conflict_do_update(
+            index_elements=[*KEY_COLUMNS, "period_start"],
+            set_={stat: query.excluded[stat] for stat in STAT_COLUMNS}
+        )
+
+        await execute_query(db, query, QueryResultType.none)
+
+    @staticmethod
+    async def fetch_report(db: AsyncEngine, guild_id: int, start: date, end: date, period: str = "day", **kwargs) -> list[dict]:
+        """
+        Totals per player and subject for `start <= period < end`, largest post count first.
+        `period` picks the table: "day", "week" or "month". Week/month bounds should be period starts.
+        """
+        table, column = {
+            "day": (PostStats.daily_table, "day"),
+            "week": (PostStats.weekly_table, "period_start"),
+            "month": (PostStats.monthly_table, "period_start")
+        }[period]
+
+        conditions = [
+            table.c.guild_id == guild_id,
+            table.c[column] >= start,
+            table.c[column] < end
+        ]
+
+        if (player_id := kwargs.get("player_id")) is not None:
+            conditions.append(table.c.player_id == player_id)
+
+        if subject_type := kwargs.get("subject_type"):
+            conditions.append(table.c.subject_type == subject_type)
+
+        query = (
+            sa.select(
+                *[table.c[column] for column in KEY_COLUMNS],
+                *[sa.func.sum(table.c[stat]).label(stat) for stat in STAT_COLUMNS]
+            )
+            .where(sa.and_(*conditions))
+            .group_by(*[table.c[column] for column in KEY_COLUMNS])
+            .order_by(sa.func.sum(table.c.count).desc())
+        )
+
+        rows = await execute_query(db, query, QueryResultType.multiple, replica=kwargs.get("replica", True))
+
+        return [dict(row._mapping) for row in rows]
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Union
+import asyncio
 import uuid
 import sqlalchemy as sa
 import discord
@@ -8,8 +9,9 @@ from sqlalchemy.dialects.postgresql import insert
 from marshmallow import Schema, fields, post_load
 from Steward.models import metadata
 from Steward.models.objects.enum import QueryResultType
-from Steward.utils.dbUtils import execute_query
+from Steward.utils.dbUtils import after_commit, db_session, execute_query
 from Steward.utils.discordUtils import try_delete
+from Steward.utils.trackingUtils import tracked_messages
 from constants import CHANNEL_BREAK
 
 
@@ -86,6 +88,9 @@ class Request:
         sa.Column("staff_message_id", sa.BigInteger, nullable=True),
         sa.Column("player_message_id", sa.BigInteger, nullable=True),
         sa.Column("created_ts", sa.TIMESTAMP(timezone=timezone.utc), nullable=False),
+        sa.Index("idx_requests_guild_player", "guild_id", "player_id"),
+        sa.Index("idx_requests_staff_message", "staff_message_id"),
+        sa.Index("idx_requests_player_message", "player_message_id")
     )
 
     class RequestSchema(Schema):
@@ -150,33 +155,40 @@ class Request:
                 .returning(self.request_table)
             )
 
-        result = await execute_query(self._bot.db, query)
+        # Indexed before the write so a deletion racing it still falls through to the query
+        tracked_messages.add("request", self.staff_message_id, self.player_message_id)
 
-        if self.id is None and result:
-            row = result[0] if isinstance(result, list) else result
-            self.id = dict(row._mapping)["id"]
+        async with db_session(self._bot.db):
+            result = await execute_query(self._bot.db, query)
 
-        # Sync player characters
-        delete_all_query = (
-            self.request_characters_table.delete()
-            .where(self.request_characters_table.c.request_id == self.id)
-        )
-        await execute_query(self._bot.db, delete_all_query, QueryResultType.none)  
+            if self.id is None and result:
+                row = result[0] if isinstance(result, list) else result
+                self.id = dict(row._mapping)["id"]
+
+            # Sync player characters
+            delete_all_query = (
+                self.request_characters_table.delete()
+                .where(self.request_characters_table.c.request_id == self.id)
+            )
+            await execute_query(self._bot.db, delete_all_query, QueryResultType.none)  
         
-        for player, characters in self.player_characters.items():
-            for character in characters:
-                insert_dict = {
+            character_rows = [
+                {
                     "request_id": self.id,
                     "player_id": player.id,
                     "character_id": character.id
                 }
+                for player, characters in self.player_characters.items()
+                for character in characters
+            ]
 
+            if character_rows:
                 character_query = (
                     self.request_characters_table.insert()
-                    .values(**insert_dict)
+                    .values(character_rows)
                 )
 
-                result = await execute_query(self._bot.db, character_query, QueryResultType.none)
+                await execute_query(self._bot.db, character_query, QueryResultType.none)
 
         return self
     
@@ -194,14 +206,19 @@ class Request:
             )
         )
 
-        await execute_query(self._bot.db, delete_characters_query, QueryResultType.none)
-
         query = (
             self.request_table.delete()
             .where(self.request_table.c.id == self.id)
         )
 
-        await execute_query(self._bot.db, query, QueryResultType.none)
+        async with db_session(self._bot.db):
+            await execute_query(self._bot.db, delete_characters_query, QueryResultType.none)
+            await execute_query(self._bot.db, query, QueryResultType.none)
+
+            after_commit(
+                self._bot.db,
+                lambda: tracked_messages.discard("request", self.staff_message_id, self.player_message_id)
+            )
 
     @classmethod
     async def fetch_all(cls, bot: "StewardBot", guild_id: int = None, player_id: int = None) -> list["Request"]:
@@ -262,9 +279,7 @@ class Request:
                 player_characters: dict["Player", list["Character"]] = {}
 
                 for char_row in char_rows:
-                    mapping = char_row._mapping
-                    player_id_char = mapping['player_id']
-                    character_id = mapping['character_id']
+                    player_id_char = char_row._mapping['player_id']
 
                     if player_id_char not in player_cache:
                         player_cache[player_id_char] = await Player.get_or_create(
@@ -272,8 +287,12 @@ class Request:
                             request.server.get_member(player_id_char)
                         )
 
-                    player = player_cache[player_id_char]
-                    character = await Character.fetch(bot.db, character_id, active_only=False)
+                characters = await asyncio.gather(
+                    *[Character.fetch(bot.db, char_row._mapping['character_id'], active_only=False) for char_row in char_rows]
+                )
+
+                for char_row, character in zip(char_rows, characters):
+                    player = player_cache[char_row._mapping['player_id']]
                     if character is None:
                         continue
 
@@ -340,9 +359,7 @@ class Request:
         player_characters: dict["Player", list["Character"]] = {}
 
         for row in char_rows:
-            mapping = row._mapping
-            player_id = mapping['player_id']
-            character_id = mapping['character_id']
+            player_id = row._mapping['player_id']
 
             if player_id not in player_cache:
                 player_cache[player_id] = await Player.get_or_create(
@@ -350,8 +367,12 @@ class Request:
                     request.server.get_member(player_id)
                 )
 
-            player = player_cache[player_id]
-            character = await Character.fetch(bot.db, character_id, active_only=False)
+        characters = await asyncio.gather(
+            *[Character.fetch(bot.db, row._mapping['character_id'], active_only=False) for row in char_rows]
+        )
+
+        for row, character in zip(char_rows, characters):
+            player = player_cache[row._mapping['player_id']]
             if character is None:
                 continue
 
@@ -376,19 +397,23 @@ class Request:
         from .log import StewardLog
         from .enum import LogEvent
         from ..views.request import LoggedView
+        from .character import Character
 
-        for player, characters in self.player_characters.items():
-            for character in characters:
-                updated_character = await character.fetch(bot.db, character.id)
-                await StewardLog.create(
-                        bot,
-                        author,
-                        player,
-                        LogEvent.activity,
-                        character=updated_character,
-                        activity=activity,
-                        notes=self.notes
-                    )
+        pairs = [(player, character) for player, characters in self.player_characters.items() for character in characters]
+        updated_characters = await asyncio.gather(
+            *[Character.fetch(bot.db, character.id) for _, character in pairs]
+        )
+
+        for (player, _), updated_character in zip(pairs, updated_characters):
+            await StewardLog.create(
+                    bot,
+                    author,
+                    player,
+                    LogEvent.activity,
+                    character=updated_character,
+                    activity=activity,
+                    notes=self.notes
+                )
         try:
             view = LoggedView(self, activity, author)
             await self.player_channel.send(view=view)
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 from datetime import datetime, timezone, timedelta
 import json
 import logging
@@ -12,17 +13,33 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from Steward.models import metadata
 from Steward.models.automation.context import AutomationContext
 from Steward.models.automation.evaluators import evaluate_expression
-from Steward.models.automation.utils import eval_bool, eval_int
+from Steward.models.automation.utils import eval_bool, eval_bool_many, eval_int
 from Steward.models.objects.enum import PatrolOutcome, QueryResultType, RuleTrigger
 from Steward.models.views.request import StaffRequestView
+from Steward.utils.cacheUtils import TTLCache, publish_invalidation, register_invalidation
 from Steward.utils.dbUtils import execute_query
 from Steward.utils.discordUtils import chunk_text, get_webhook
+from Steward.utils.rowUtils import RowMapper
+from constants import RULES_CACHE_TTL, SERVER_CACHE_SIZE
 
 log = logging.getLogger(__name__)
 
+RESET_CHUNK_SIZE = 500
+
 if TYPE_CHECKING:
     from ...bot import StewardBot
 
+def _parse_action_data(action_data):
+    # Mirrors RuleSchema.process_action_data: older rows stored the JSON as a string
+    if isinstance(action_data, str):
+        try:
+            return json.loads(action_data)
+        except ValueError:
+            pass
+
+    return action_data
+
+
 class StewardRule:
     def __init__(self, db: AsyncEngine, **kwargs):
         self._db = db
@@ -506,24 +523,57 @@ class StewardRule:
         )
 
         row = await execute_query(self._db, query)
-        return StewardRule.RuleSchema(self._db).load(dict(row._mapping))
+        await publish_invalidation(self._db, "rules", self.guild_id)
+
+        return StewardRule.from_row(self._db, row)
+
+    # Enabled rule rows per guild id, highest priority first. Rows rather than StewardRule
+    # objects so every caller gets its own instances to mutate.
+    _cache: TTLCache[list[dict]] = TTLCache(RULES_CACHE_TTL, SERVER_CACHE_SIZE)
 
     @staticmethod
-    async def get_rules_for_trigger(db: AsyncEngine, guild_id: int, trigger: str) -> list["StewardRule"]:
-        query = (
+    def _enabled_rules_query(guild_ids: list[int]) -> sa.Select:
+        return (
             StewardRule.rules_table.select()
             .where(
                 sa.and_(
-                    StewardRule.rules_table.c.guild_id == guild_id,
-                    StewardRule.rules_table.c.trigger == trigger,
+                    StewardRule.rules_table.c.guild_id.in_(guild_ids),
                     StewardRule.rules_table.c.enabled == True
                 )
             )
             .order_by(StewardRule.rules_table.c.priority.desc())
         )
 
-        rows = await execute_query(db, query, QueryResultType.multiple)
-        return [StewardRule.RuleSchema(db).load(dict(row._mapping)) for row in rows]
+    @staticmethod
+    async def warm(db: AsyncEngine, guild_ids: list[int]) -> int:
+        """Cache the enabled rules of every guild in `guild_ids` with one query. Returns the rule count."""
+        if not guild_ids:
+            return 0
+
+        rows = await execute_query(db, StewardRule._enabled_rules_query(guild_ids), QueryResultType.multiple)
+
+        grouped: dict[int, list[dict]] = {guild_id: [] for guild_id in guild_ids}
+        for row in rows:
+            grouped[row.guild_id].append(dict(row._mapping))
+
+        for guild_id, rules in grouped.items():
+            StewardRule._cache.set(guild_id, rules)
+
+        return len(rows)
+
+    @staticmethod
+    async def get_rules_for_trigger(db: AsyncEngine, guild_id: int, trigger: str) -> list["StewardRule"]:
+        rules = StewardRule._cache.get(guild_id)
+
+        if rules is None:
+            rows = await execute_query(db, StewardRule._enabled_rules_query([guild_id]), QueryResultType.multiple)
+            rules = [dict(row._mapping) for row in rows]
+            StewardRule._cache.set(guild_id, rules)
+
+        return [
+            StewardRule.from_row(db, {**rule, "action_data": copy.deepcopy(rule["action_data"])})
+            for rule in rules if rule["trigger"] == trigger
+        ]
     
     @staticmethod
     async def get_all_rules_for_server(db: AsyncEngine, guild_id: int) -> list["StewardRule"]:
@@ -536,7 +586,7 @@ class StewardRule:
         )
 
         rows = await execute_query(db, query, QueryResultType.multiple)
-        return [StewardRule.RuleSchema(db).load(dict(row._mapping)) for row in rows]
+        return StewardRule.from_row.all(db, rows)
 
     @staticmethod
     async def get_all_scheduled_rules(db: AsyncEngine) -> list["StewardRule"]:
@@ -554,7 +604,9 @@ class StewardRule:
         )
 
         rows = await execute_query(db, query, QueryResultType.multiple)
-        return [StewardRule.RuleSchema(db).load(dict(row._mapping)) for row in rows]
+        return StewardRule.from_row.all(db, rows)
+
+    from_row = RowMapper(converters={"trigger": RuleTrigger.from_string, "action_data": _parse_action_data})
 
     class RuleSchema(Schema):
         db: AsyncEngine
@@ -614,7 +666,7 @@ class StewardRule:
         if not row:
             return None
         
-        return StewardRule.RuleSchema(db).load(dict(row._mapping))
+        return StewardRule.from_row(db, row)
     
     async def _reward(self, action: dict, bot: "StewardBot", context: "AutomationContext", results: []):
         from .log import StewardLog
@@ -734,8 +786,9 @@ class StewardRule:
             results.append({'type': self.trigger.name, 'success': False, 'error': 'No content or embed'})
 
     async def _reset_limited(self, action: dict, bot: "StewardBot", context: "AutomationContext", results: []):
+        from .character import Character
+
         characters = await context.server.get_all_characters()
-        tasks = []
 
         for character in characters:
             if action.get('xp', True) == True:
@@ -744,12 +797,24 @@ class StewardRule:
                 character.limited_currency = 0
             if action.get('activity_points', True) == True:
                 character.activity_points = 0
-            tasks.append(character.upsert())
 
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        # Each chunk commits on its own, so one bad row only loses its chunk rather than the whole reset
+        saved, failed = 0, 0
 
-        results.append({'type': self.trigger.name, 'success': True, 'count': len(characters)})
+        for start in range(0, len(characters), RESET_CHUNK_SIZE):
+            chunk = characters[start:start + RESET_CHUNK_SIZE]
+
+            try:
+                await Character.bulk_upsert(bot.db, chunk)
+                saved += len(chunk)
+            except Exception:
+                log.exception(f"Rule {self.id}: failed to reset {len(chunk)} characters in guild {self.guild_id}")
+                failed += len(chunk)
+
+        if failed:
+            results.append({'type': self.trigger.name, 'success': False, 'count': saved, 'error': f'{failed} characters were not reset'})
+        else:
+            results.append({'type': self.trigger.name, 'success': True, 'count': saved})
 
     async def _bulk_reward(self, action: dict, bot: "StewardBot", context: "AutomationContext", results: []):
         from .log import StewardLog
@@ -761,13 +826,14 @@ class StewardRule:
         if not players:
             results.append({'type': self.trigger.name, 'success': False, 'error': 'No players found in the server'})
 
-        for player in players:
-            ctx = AutomationContext(player=player, server=context.server)
+        players = [player for player in players if player.active_characters]
+        conditions = eval_bool_many(
+            action.get('condition', ''),
+            [AutomationContext(player=player, server=context.server) for player in players]
+        )
 
-            if not player.active_characters:
-                continue
-            
-            if eval_bool(action.get('condition', ''), ctx) == True:
+        for player, condition in zip(players, conditions):
+            if condition:
                 tasks.append(StewardLog.create(
                     bot,
                     author=bot.user,
@@ -1080,11 +1146,4 @@ class StewardRule:
         results.append({'type': self.trigger.name, 'success': True})
 
 
-        
-    
-
-
-
-
-
-
+register_invalidation("rules", StewardRule._cache)
@@ -1,19 +1,22 @@
+from collections import defaultdict
 from decimal import Decimal
+from timeit import default_timer as timer
 from typing import TYPE_CHECKING, List, Optional, Union
 import discord
 import sqlalchemy as sa
-import asyncio
 
 from sqlalchemy.ext.asyncio import AsyncEngine
 from marshmallow import Schema, fields, post_load
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, aggregate_order_by
 from Steward.models import metadata
 from Steward.models.automation.context import AutomationContext
 from Steward.models.automation.evaluators import evaluate_expression
 from Steward.models.objects.enum import QueryResultType
 from Steward.models.objects.npc import NPC
+from Steward.utils.cacheUtils import TTLCache, publish_invalidation, register_invalidation
 from Steward.utils.dbUtils import execute_query
-from constants import BOT_OWNERS
+from Steward.utils.discordUtils import delegate_slots
+from constants import BOT_OWNERS, SERVER_CACHE_SIZE, SERVER_CACHE_TTL
 
 if TYPE_CHECKING:
     from .character import Character
@@ -22,15 +25,11 @@ if TYPE_CHECKING:
     from .levels import Levels
     from .activity import Activity
 
+@delegate_slots("_guild", discord.Guild)
 class Server(discord.Guild):
     def __init__(self, db: AsyncEngine, guild: discord.Guild, **kwargs):
         self._db = db
-        
-        for attr in guild.__slots__:
-            try:
-                setattr(self, attr, getattr(guild, attr))
-            except AttributeError:
-                pass
+        self._guild = guild
 
         self.max_level = kwargs.get("max_level", 3)
         self.currency_limit_expr = kwargs.get("currency_limit_expr", "10")
@@ -87,31 +86,49 @@ class Server(discord.Guild):
         def make_guild(self, data, **kwargs) -> dict:
             return data
 
-    async def load_npcs(self) -> None:
-            query = (
-                NPC.npc_table.select()
-                .where(
-                    sa.and_(
-                        NPC.npc_table.c.guild_id == self.id,
-                        NPC.npc_table.c.adventure_id == sa.null()
-                    )
+    @staticmethod
+    def _guild_clause(column: sa.Column, guild_id: Union[int, list[int]]) -> sa.ColumnElement:
+        # Builders below take one guild id, or a list of them for the bulk warm-up
+        return column.in_(guild_id) if isinstance(guild_id, list) else column == guild_id
+
+    @staticmethod
+    def _npcs_query(guild_id: Union[int, list[int]]) -> sa.Select:
+        return (
+            NPC.npc_table.select()
+            .where(
+                sa.and_(
+                    Server._guild_clause(NPC.npc_table.c.guild_id, guild_id),
+                    NPC.npc_table.c.adventure_id == sa.null()
                 )
-                .order_by(NPC.npc_table.c.key.asc())
             )
+            .order_by(NPC.npc_table.c.key.asc())
+        )
 
-            rows = await execute_query(self._db, query, QueryResultType.multiple)
+    async def load_npcs(self) -> None:
+            rows = await execute_query(self._db, self._npcs_query(self.id), QueryResultType.multiple)
 
-            self.npcs = [NPC.NPCSchema(self._db).load(dict(row._mapping)) for row in rows]
+            self._apply_npcs([dict(row._mapping) for row in rows])
 
-    async def load_activity_points(self) -> None:        
+    def _apply_npcs(self, rows: list[dict]) -> None:
+        self.npcs = [NPC.NPCSchema(self._db).load(row) for row in rows]
+
+    @staticmethod
+    def _activity_points_query(guild_id: Union[int, list[int]]) -> sa.Select:
         from Steward.models.objects.activityPoints import ActivityPoints
-        query = (
+
+        return (
             ActivityPoints.activity_points_table.select()
-            .where(ActivityPoints.activity_points_table.c.guild_id == self.id)
+            .where(Server._guild_clause(ActivityPoints.activity_points_table.c.guild_id, guild_id))
             .order_by(ActivityPoints.activity_points_table.c.level.asc())
         )
 
-        rows = await execute_query(self._db, query, QueryResultType.multiple)
+    async def load_activity_points(self) -> None:        
+        rows = await execute_query(self._db, self._activity_points_query(self.id), QueryResultType.multiple)
+
+        await self._apply_activity_points([dict(row._mapping) for row in rows])
+
+    async def _apply_activity_points(self, rows: list[dict]) -> None:
+        from Steward.models.objects.activityPoints import ActivityPoints
 
         if not rows:
             # Our own...cause I'm lazy like that
@@ -168,25 +185,33 @@ class Server(discord.Guild):
                 }
             }
             
-            upsert_tasks = [
-                ActivityPoints(self._db, guild_id=self.id, level=lvl, points=data["msg"], xp_expr=str(data["xp"]), currency_expr=str(data["currency"])).upsert()
-                for lvl, data in default.items()
-            ]
-            results = await asyncio.gather(*upsert_tasks)
-            self.activity_points = results
+            self.activity_points = await ActivityPoints.bulk_upsert(
+                self._db,
+                [
+                    ActivityPoints(self._db, guild_id=self.id, level=lvl, points=data["msg"], xp_expr=str(data["xp"]), currency_expr=str(data["currency"]))
+                    for lvl, data in default.items()
+                ]
+            )
         else:
-            self.activity_points = [ActivityPoints.ActivityPointsSchema(self._db).load(dict(row._mapping)) for row in rows]
+            self.activity_points = [ActivityPoints.ActivityPointsSchema(self._db).load(row) for row in rows]
 
-    async def load_levels(self) -> None:
+    @staticmethod
+    def _levels_query(guild_id: Union[int, list[int]]) -> sa.Select:
         from Steward.models.objects.levels import Levels
 
-        query = (
+        return (
             Levels.level_table.select()
-            .where(Levels.level_table.c.guild_id == self.id)
+            .where(Server._guild_clause(Levels.level_table.c.guild_id, guild_id))
             .order_by(Levels.level_table.c.level.asc())
         )
 
-        rows = await execute_query(self._db, query, QueryResultType.multiple)
+    async def load_levels(self) -> None:
+        rows = await execute_query(self._db, self._levels_query(self.id), QueryResultType.multiple)
+
+        await self._apply_levels([dict(row._mapping) for row in rows])
+
+    async def _apply_levels(self, rows: list[dict]) -> None:
+        from Steward.models.objects.levels import Levels
 
         if not rows:
             # 5e Standard XP Ranges + tiers (1-4, 5-10, 11-16, 17-20)
@@ -213,45 +238,97 @@ class Server(discord.Guild):
                 20: (335000, 4)
             }
 
-            upsert_tasks = [
-                Levels(self._db, self.id, lvl, xp, tier).upsert()
-                for lvl, (xp, tier) in default.items()
-            ]
-            results = await asyncio.gather(*upsert_tasks)
-            self.levels = results
+            self.levels = await Levels.bulk_upsert(
+                self._db,
+                [
+                    Levels(self._db, self.id, lvl, xp, tier)
+                    for lvl, (xp, tier) in default.items()
+                ]
+            )
         else:
-            self.levels = [Levels.LevelSchema(self._db).load(dict(row._mapping)) for row in rows]
+            self.levels = [Levels.LevelSchema(self._db).load(row) for row in rows]
 
-    async def load_activities(self) -> None:
+    @staticmethod
+    def _activities_query(guild_id: Union[int, list[int]]) -> sa.Select:
         from .activity import Activity
 
-        query = (
+        return (
             Activity.activity_table.select()
             .where(
                 sa.and_(
-                    Activity.activity_table.c.guild_id == self.id,
+                    Server._guild_clause(Activity.activity_table.c.guild_id, guild_id),
                     Activity.activity_table.c.active == True
                 )
             )
         )
 
-        rows = await execute_query(self._db, query, QueryResultType.multiple)
+    async def load_activities(self) -> None:
+        rows = await execute_query(self._db, self._activities_query(self.id), QueryResultType.multiple)
 
-        if not rows:
-            self.activities = []
-        else:
-            self.activities = [Activity.ActivitySchema(self._db).load(dict(row._mapping)) for row in rows]
+        self._apply_activities([dict(row._mapping) for row in rows])
+
+    def _apply_activities(self, rows: list[dict]) -> None:
+        from .activity import Activity
+
+        self.activities = [Activity.ActivitySchema(self._db).load(row) for row in rows]
+
+    _CHILD_COLLECTIONS = ("npcs", "activity_points", "levels", "activities")
 
     @classmethod
-    async def get_or_create(cls, db: AsyncEngine, guild: discord.Guild) -> "Server":
-        query = (
-            cls.guilds_table.select()
-            .where(cls.guilds_table.c.id == guild.id)
+    def _hydration_query(cls, guild_id: int) -> sa.Select:
+        """
+        The server row plus every child collection as a JSON array column, so a cold
+        hydration is a single round trip.
+        """
+        def as_json(query: sa.Select, *order_by: str) -> sa.ScalarSelect:
+            rows = query.subquery()
+
+            aggregate = sa.func.json_agg(
+                aggregate_order_by(rows.table_valued(), *[rows.c[col] for col in order_by])
+                if order_by else rows.table_valued()
+            )
+
+            return (
+                sa.select(sa.func.coalesce(aggregate, sa.text("'[]'::json"), type_=JSON))
+                .select_from(rows)
+                .scalar_subquery()
+            )
+
+        return (
+            sa.select(
+                cls.guilds_table,
+                as_json(cls._npcs_query(guild_id), "key").label("npcs"),
+                as_json(cls._activity_points_query(guild_id), "level").label("activity_points"),
+                as_json(cls._levels_query(guild_id), "level").label("levels"),
+                as_json(cls._activities_query(guild_id)).label("activities")
+            )
+            .where(cls.guilds_table.c.id == guild_id)
         )
 
-        row = await execute_query(db, query)
+    # Hydrated servers by guild id. Writes to the server or its reference data publish an
+    # invalidation, which evicts it here and in every other process
+    _cache: TTLCache["Server"] = TTLCache(SERVER_CACHE_TTL, SERVER_CACHE_SIZE)
+
+    @classmethod
+    def invalidate(cls, guild_id: int) -> None:
+        cls._cache.invalidate(guild_id)
+
+    @classmethod
+    async def get_or_create(cls, db: AsyncEngine, guild: discord.Guild) -> "Server":
+        # Callers may hand back a Server; wrap its guild, never the wrapper itself
+        guild = getattr(guild, "_guild", guild)
+
+        if (server := cls._cache.get(guild.id)) and server._db is db:
+            # The gateway may have replaced the guild object since this server was cached
+            server._guild = guild
+            return server
 
-        if not row:
+        row = await execute_query(db, cls._hydration_query(guild.id))
+
+        if row:
+            data = dict(row._mapping)
+            children = {key: data.pop(key) for key in cls._CHILD_COLLECTIONS}
+        else:
             insert_query = (
                 cls.guilds_table.insert()
                 .values(
@@ -267,17 +344,76 @@ class Server(discord.Guild):
                 .returning(cls.guilds_table)
             )
 
-            row = await execute_query(db, insert_query)
+            data = dict((await execute_query(db, insert_query))._mapping)
+            children = {key: [] for key in cls._CHILD_COLLECTIONS}
 
-        data = cls.ServerSchema().load(dict(row._mapping))
+        server = cls(db, guild, **cls.ServerSchema().load(data))
+        server._apply_npcs(children["npcs"])
+        await server._apply_activity_points(children["activity_points"])
+        await server._apply_levels(children["levels"])
+        server._apply_activities(children["activities"])
 
-        server = cls(db, guild, **data)
-        await server.load_npcs()
-        await server.load_activity_points()
-        await server.load_levels()
-        await server.load_activities()
+        cls._cache.set(guild.id, server)
         
         return server
+
+    @classmethod
+    async def warm(cls, db: AsyncEngine, guilds: list[discord.Guild]) -> dict[str, float]:
+        """
+        Hydrate and cache every guild in `guilds` with one query per table instead of one
+        hydration per guild. Guilds without a servers row are left to get_or_create.
+        Returns the seconds spent in each phase.
+        """
+        timings: dict[str, float] = {}
+        guilds_by_id = {guild.id: guild for guild in guilds if guild}
+
+        if not guilds_by_id:
+            return timings
+
+        async def fetch(phase: str, query: sa.Select) -> list:
+            start = timer()
+            rows = await execute_query(db, query, QueryResultType.multiple)
+            timings[phase] = timer() - start
+
+            return rows
+
+        server_rows = await fetch(
+            "servers",
+            cls.guilds_table.select().where(cls.guilds_table.c.id.in_(list(guilds_by_id)))
+        )
+        guild_ids = [row.id for row in server_rows]
+
+        if not guild_ids:
+            return timings
+
+        children: dict[str, dict[int, list[dict]]] = {}
+        for key, query in (
+            ("npcs", cls._npcs_query(guild_ids)),
+            ("activity_points", cls._activity_points_query(guild_ids)),
+            ("levels", cls._levels_query(guild_ids)),
+            ("activities", cls._activities_query(guild_ids))
+        ):
+            grouped = defaultdict(list)
+
+            for row in await fetch(key, query):
+                grouped[row.guild_id].append(dict(row._mapping))
+
+            children[key] = grouped
+
+        start = timer()
+
+        for row in server_rows:
+            server = cls(db, guilds_by_id[row.id], **cls.ServerSchema().load(dict(row._mapping)))
+            server._apply_npcs(children["npcs"].get(row.id, []))
+            await server._apply_activity_points(children["activity_points"].get(row.id, []))
+            await server._apply_levels(children["levels"].get(row.id, []))
+            server._apply_activities(children["activities"].get(row.id, []))
+
+            cls._cache.set(row.id, server)
+
+        timings["build"] = timer() - start
+
+        return timings
     
     async def save(self) -> None:
         query = (
@@ -298,6 +434,7 @@ class Server(discord.Guild):
         )
 
         await execute_query(self._db, query)
+        await publish_invalidation(self._db, "server", self.id)
 
     async def get_npc(self, **kwargs) -> NPC:
         if kwargs.get("key"):
@@ -340,7 +477,7 @@ class Server(discord.Guild):
 
         rows = await execute_query(self._db, query, QueryResultType.multiple)
 
-        characters = [Character.CharacterSchema(self._db).load(dict(row._mapping)) for row in rows]
+        characters = Character.from_row.all(self._db, rows)
 
         return characters
     
@@ -361,7 +498,7 @@ class Server(discord.Guild):
             return players
 
         members_by_id = {member.id: member for member in self.members}
-        player_data = [Player.PlayerSchema().load(dict(row._mapping)) for row in rows]
+        player_data = [Player._row_data(row) for row in rows]
         player_ids = [data["id"] for data in player_data]
 
         characters_by_player = {player_id: [] for player_id in player_ids}
@@ -377,7 +514,7 @@ class Server(discord.Guild):
 
         char_rows = await execute_query(self._db, char_query, QueryResultType.multiple)
         for row in char_rows:
-            character = Character.CharacterSchema(self._db).load(dict(row._mapping))
+            character = Character.from_row(self._db, row)
             characters_by_player.setdefault(character.player_id, []).append(character)
 
         for data in player_data:
@@ -479,4 +616,7 @@ class Server(discord.Guild):
         
         for activity in self.activities:
             if activity.name.lower() == act_name.lower():
-                return activity
\ No newline at end of file
+                return activity
+
+
+register_invalidation("server", Server._cache)
@@ -12,7 +12,7 @@ async def activity_autocomplete(ctx: discord.AutocompleteContext):
     """Lightweight autocomplete for activities - loads only activities without full server data"""
     try:
         # Load activities directly without full server initialization
-        activities = await Activity.fetch_by_guild(ctx.bot.db, ctx.interaction.guild.id)
+        activities = await Activity.fetch_by_guild(ctx.bot.db, ctx.interaction.guild.id, replica=True)
         
         # Filter based on user input for faster response
         user_input = ctx.value.lower() if ctx.value else ""
@@ -40,7 +40,7 @@ async def character_autocomplete(ctx: discord.AutocompleteContext):
 async def form_autocomplete(ctx: discord.AutocompleteContext):
     """Lightweight autocomplete for form templates"""
     try:
-        templates = await FormTemplate.fetch_all(ctx.bot.db, ctx.interaction.guild.id)
+        templates = await FormTemplate.fetch_all(ctx.bot.db, ctx.interaction.guild.id, replica=True)
 
         # Filter based on user input for faster response
         user_input = ctx.value.lower() if ctx.value else ""
@@ -64,7 +64,7 @@ async def patrol_outcome_autocomplete(ctx: discord.AutocompleteContext):
 async def auction_house_autocomplete(ctx: discord.AutocompleteContext):
     """Autocomplete for auction house names in the current guild"""
     try:
-        houses = await AuctionHouse.fetch_all(ctx.bot, load_related=False)
+        houses = await AuctionHouse.fetch_all(ctx.bot, load_related=False, replica=True)
         user_input = ctx.value.lower() if ctx.value else ""
 
         names = [
@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+import sqlalchemy as sa
+
+from collections import OrderedDict
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+from Steward.models.objects.enum import QueryResultType
+from Steward.utils.dbUtils import after_commit, db_session, execute_query
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """
+    Small in-process LRU cache whose entries expire `ttl` seconds after they are set.
+    Not shared between processes; register it with `register_invalidation` and call
+    `publish_invalidation` on writes so every process evicts the entry.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[Hashable, tuple[float, T]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, count=False) is not None
+
+    def get(self, key: Hashable, count: bool = True) -> Optional[T]:
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+
+            if count:
+                self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+
+        if count:
+            self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: T) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0
+        }
+
+
+# Postgres NOTIFY channel carrying {"entity", "guild_id", "key", "origin"} payloads
+CACHE_CHANNEL = "steward_cache"
+
+# Identifies this process so it can skip its own notifications
+PROCESS_ID = uuid.uuid4().hex
+
+# entity -> (cache, maps (guild_id, key) to the cache key)
+_invalidation_targets: dict[str, tuple[TTLCache, Callable[[Optional[int], Any], Hashable]]] = {}
+
+
+def register_invalidation(entity: str, cache: TTLCache, cache_key: Callable[[Optional[int], Any], Hashable] = lambda guild_id, key: guild_id) -> None:
+    _invalidation_targets[entity] = (cache, cache_key)
+
+
+def evict(entity: str, guild_id: Optional[int], key: Any = None) -> None:
+    if target := _invalidation_targets.get(entity):
+        cache, cache_key = target
+        cache.invalidate(cache_key(guild_id, key))
+
+
+def clear_registered_caches() -> None:
+    for cache, _ in _invalidation_targets.values():
+        cache.clear()
+
+
+async def publish_invalidation(db: AsyncEngine, entity: str, guild_id: Optional[int], key: Any = None, local: bool = True) -> None:
+    """
+    Evict `entity` from this process's cache (unless `local=False`, for callers that write
+    through instead) and tell every other process to do the same.
+    Inside a db_session the notification rides the session's transaction, so it is only
+    delivered if that commits; Postgres also folds identical notifications in one transaction.
+    The local eviction happens now and again once the session commits, since a read in
+    between can re-cache the pre-commit row.
+    """
+    await publish_invalidations(db, entity, [(guild_id, key)], local)
+
+
+async def publish_invalidations(db: AsyncEngine, entity: str, targets: Iterable[tuple[Optional[int], Any]], local: bool = True) -> None:
+    """`publish_invalidation` for many (guild_id, key) pairs, sent as one statement."""
+    targets = list(dict.fromkeys(targets))
+
+    if local:
+        def evict_all():
+            for guild_id, key in targets:
+                evict(entity, guild_id, key)
+
+        evict_all()
+        after_commit(db, evict_all)
+
+    if not targets or db.dialect.name != "postgresql":
+        return
+
+    payloads = sa.func.unnest(sa.bindparam("payloads", [
+        json.dumps({"entity": entity, "guild_id": guild_id, "key": key, "origin": PROCESS_ID}, default=str)
+        for guild_id, key in targets
+    ], type_=ARRAY(sa.Text))).table_valued("payload")
+
+    async with db_session(db):
+        await execute_query(db, sa.select(sa.func.pg_notify(CACHE_CHANNEL, payloads.c.payload)), QueryResultType.none)
+
+
+class CacheInvalidationListener:
+    """
+    Holds a dedicated asyncpg connection that LISTENs on CACHE_CHANNEL and evicts whatever
+    other processes report as changed. Reconnects with backoff; after a reconnect every
+    registered cache is cleared, since notifications sent while disconnected are lost.
+    """
+
+    HEALTH_CHECK_SECONDS = 60
+    MAX_BACKOFF_SECONDS = 60
+
+    def __init__(self, url: str):
+        # asyncpg wants a plain postgresql:// DSN, not the SQLAlchemy driver URL
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+        self.connected = False
+        self.received = 0
+        self.reconnects = 0
+
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        backoff = 1
+        first = True
+
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                log.warning(f"Cache listener could not connect ({e}); retrying in {backoff}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.MAX_BACKOFF_SECONDS)
+                continue
+
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _: closed.set())
+
+            try:
+                await conn.add_listener(CACHE_CHANNEL, self._on_notify)
+
+                if not first:
+                    self.reconnects += 1
+                    clear_registered_caches()
+                    log.info("Cache listener reconnected; cleared in-process caches")
+
+                first = False
+                backoff = 1
+                self.connected = True
+
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), self.HEALTH_CHECK_SECONDS)
+                    except asyncio.TimeoutError:
+                        await conn.fetchval("SELECT 1")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                log.warning(f"Cache listener connection lost ({e})")
+            finally:
+                self.connected = False
+
+                if not conn.is_closed():
+                    await conn.close(timeout=5)
+
+            await asyncio.sleep(backoff)
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            log.warning(f"Ignoring malformed cache notification: {payload!r}")
+            return
+
+        if message.get("origin") == PROCESS_ID:
+            return
+
+        self.received += 1
+        evict(message.get("entity"), message.get("guild_id"), message.get("key"))
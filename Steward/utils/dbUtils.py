@@ -1,49 +1,253 @@
+import asyncio
 import logging
+import sys
+import time
+import sqlalchemy as sa
 
-from sqlalchemy.ext.asyncio import AsyncEngine
-from sqlalchemy.engine import Result,Row 
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import Context, ContextVar
+from sqlalchemy import event
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncTransaction, create_async_engine
+from sqlalchemy.engine import Compiled, Result, Row
 from sqlalchemy.sql import Insert, Update, Delete
-from typing import Optional, Union
+from typing import Any, AsyncIterator, Callable, Optional, Union
 
 from sqlalchemy import FromClause, TableClause
+from sqlalchemy.dialects.postgresql import insert
 
 from Steward.models.objects.enum import QueryResultType
+from constants import DB_MAX_OVERFLOW, DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_PREPARED_STATEMENT_CACHE_SIZE, DB_QUERY_STATS_SAMPLES, DB_REPLICA_RETRY_SECONDS, DB_SLOW_QUERY_MS
 
 log = logging.getLogger(__name__)
 
-async def execute_query(db: AsyncEngine, query: Union[FromClause, TableClause], result_type: QueryResultType = QueryResultType.single) -> Optional[Union[Row, list[Row]]]:
-    write = isinstance(query, (Insert, Update, Delete))
+# Compiled statements keyed by query shape. Only used to render log/audit output;
+# SQLAlchemy keeps its own per-engine cache for actual execution.
+STATEMENT_CACHE_SIZE = 500
+_statement_cache: "OrderedDict[Any, Compiled]" = OrderedDict()
 
+
+def _compile_cached(query: Union[FromClause, TableClause]) -> tuple[Compiled, Optional[list]]:
+    cache_key = query._generate_cache_key()
+
+    if cache_key is None:
+        return query.compile(), None
+
+    compiled = _statement_cache.get(cache_key.key)
+
+    if compiled is None:
+        compiled = query.compile(cache_key=cache_key)
+        _statement_cache[cache_key.key] = compiled
+
+        if len(_statement_cache) > STATEMENT_CACHE_SIZE:
+            _statement_cache.popitem(last=False)
+    else:
+        _statement_cache.move_to_end(cache_key.key)
+
+    return compiled, cache_key.bindparams
+
+
+def describe_query(query: Union[FromClause, TableClause]) -> tuple[str, Optional[dict]]:
+    """
+    Render a query's SQL text and bound parameters for logging.
+    The SQL text is compiled once per query shape; parameters are bound per call.
+    """
     try:
-        query_str = str(query)
+        compiled, bindparams = _compile_cached(query)
     except Exception:
-        query_str= repr(query)
+        return repr(query), None
 
     try:
-        query_params = query.compile().params
+        if bindparams is None:
+            params = compiled.params
+        else:
+            params = compiled.construct_params(extracted_parameters=bindparams)
     except Exception:
-        query_params = None
+        params = None
 
-    try:
-        async with (db.begin() if write else db.connect()) as conn:
-            results: Result = await conn.execute(query)
-    except Exception as e:
-        if write:
-            log.error(
-                "db.write.error query=%s params=%s error=%s",
-                query_str,
-                query_params,
-                e
-            )
-        raise
+    return str(compiled), params
 
-    if write:
+
+def _is_write(query: Union[FromClause, TableClause]) -> bool:
+    return isinstance(query, (Insert, Update, Delete))
+
+
+def _log_write_success(query: Union[FromClause, TableClause]) -> None:
+    if log.isEnabledFor(logging.INFO):
+        query_str, query_params = describe_query(query)
         log.info(
             "db.write.success query=%s params=%s",
             query_str,
             query_params
         )
 
+
+def _log_write_error(query: Union[FromClause, TableClause], error: Exception) -> None:
+    if log.isEnabledFor(logging.ERROR):
+        query_str, query_params = describe_query(query)
+        log.error(
+            "db.write.error query=%s params=%s error=%s",
+            query_str,
+            query_params,
+            error
+        )
+
+
+def _call_site() -> str:
+    """First frame outside this module that belongs to the bot, e.g. `Steward.models.objects.character:Character.fetch:112`."""
+    frame = sys._getframe(1)
+
+    while frame:
+        module = frame.f_globals.get("__name__", "")
+
+        if module.startswith("Steward") and module != __name__:
+            code = frame.f_code
+            return f"{module}:{getattr(code, 'co_qualname', code.co_name)}:{frame.f_lineno}"
+
+        frame = frame.f_back
+
+    return "unknown"
+
+
+class QueryShapeStats:
+    """Timings for one statement shape. Percentiles come from the most recent samples."""
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.samples: deque[float] = deque(maxlen=DB_QUERY_STATS_SAMPLES)
+        self.slow_sites: Counter = Counter()
+
+    def record(self, seconds: float, rows: int) -> None:
+        self.count += 1
+        self.total += seconds
+        self.rows += rows
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def snapshot(self) -> dict:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "avg_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+            "rows": self.rows,
+            "avg_rows": (self.rows / self.count) if self.count else 0.0,
+            "slow": self.slow,
+            "slow_sites": dict(self.slow_sites.most_common(5))
+        }
+
+
+class QueryStats:
+    """
+    Per-shape timing histograms for every statement run through execute_query, plus a
+    bounded log of the most recent slow statements with their call site.
+    """
+
+    def __init__(self, max_shapes: int = STATEMENT_CACHE_SIZE, max_slow: int = 50):
+        self.max_shapes = max_shapes
+        self.shapes: "OrderedDict[Any, QueryShapeStats]" = OrderedDict()
+        self.slow_queries: deque[dict] = deque(maxlen=max_slow)
+
+    def _shape(self, query: Union[FromClause, TableClause], compiled: Optional[Compiled] = None) -> QueryShapeStats:
+        # The statement SQLAlchemy just executed already carries its SQL text, which is
+        # the shape; only fall back to a cache key when there is none to hand
+        if compiled is not None:
+            key = compiled.string
+        else:
+            cache_key = query._generate_cache_key()
+            key = cache_key.key if cache_key is not None else repr(query)
+
+        stats = self.shapes.get(key)
+
+        if stats is None:
+            stats = QueryShapeStats(key if compiled is not None else describe_query(query)[0])
+            self.shapes[key] = stats
+
+            if len(self.shapes) > self.max_shapes:
+                self.shapes.popitem(last=False)
+        else:
+            self.shapes.move_to_end(key)
+
+        return stats
+
+    def record(self, query: Union[FromClause, TableClause], seconds: float, rows: int, compiled: Optional[Compiled] = None) -> None:
+        try:
+            stats = self._shape(query, compiled)
+        except Exception:
+            return
+
+        stats.record(seconds, rows)
+
+        if seconds * 1000 >= DB_SLOW_QUERY_MS:
+            site = _call_site()
+            stats.slow += 1
+            stats.slow_sites[site] += 1
+
+            self.slow_queries.append({
+                "ms": seconds * 1000,
+                "rows": rows,
+                "site": site,
+                "sql": stats.sql
+            })
+            log.warning("db.slow_query ms=%.1f rows=%d site=%s query=%s", seconds * 1000, rows, site, stats.sql)
+
+    def top(self, sort_by: str = "total_ms", limit: int = 10) -> list[dict]:
+        snapshots = [stats.snapshot() for stats in self.shapes.values()]
+        return sorted(snapshots, key=lambda s: s.get(sort_by, 0), reverse=True)[:limit]
+
+    def reset(self) -> None:
+        self.shapes.clear()
+        self.slow_queries.clear()
+
+
+query_stats = QueryStats()
+
+
+def _row_count(results: Result, value: Any, result_type: QueryResultType) -> int:
+    match result_type:
+        case QueryResultType.multiple:
+            return len(value)
+        case QueryResultType.single | QueryResultType.scalar:
+            return 0 if value is None else 1
+
+    rowcount = getattr(results, "rowcount", -1)
+    return rowcount if rowcount and rowcount > 0 else 0
+
+
+async def _run(conn: AsyncConnection, query: Union[FromClause, TableClause], result_type: QueryResultType) -> Optional[Union[Row, list[Row]]]:
+    start = time.perf_counter()
+    results: Result = await conn.execute(query)
+    value = _fetch_result(results, result_type)
+    seconds = time.perf_counter() - start
+    context = getattr(results, "context", None)
+    query_stats.record(query, seconds, _row_count(results, value, result_type), getattr(context, "compiled", None))
+
+    return value
+
+
+def _fetch_result(results: Result, result_type: QueryResultType) -> Optional[Union[Row, list[Row]]]:
+    # Writes without RETURNING have nothing to fetch; reading would fail and, inside the
+    # write's transaction, roll it back
+    if not results.returns_rows:
+        return None
+
     match result_type:
         case QueryResultType.single:
             return results.first()
@@ -51,5 +255,494 @@ async def execute_query(db: AsyncEngine, query: Union[FromClause, TableClause],
             return results.fetchall()
         case QueryResultType.scalar:
             return results.scalar()
-        
-    return None
\ No newline at end of file
+
+    return None
+
+
+class PoolMetrics:
+    """
+    Live connection pool counters for one engine. Occupancy is read straight from the
+    pool; acquire wait times are recorded by `_acquire`.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self._pool = engine.sync_engine.pool
+
+        self.connects = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_last = 0.0
+
+        event.listen(self._pool, "connect", self._on_connect)
+        event.listen(self._pool, "checkout", self._on_checkout)
+        event.listen(self._pool, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, *args) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, *args) -> None:
+        self.checkouts += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_invalidate(self, *args) -> None:
+        self.invalidations += 1
+
+    def record_wait(self, seconds: float) -> None:
+        self.waits += 1
+        self.wait_total += seconds
+        self.wait_last = seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def _pool_stat(self, name: str) -> int:
+        stat = getattr(self._pool, name, None)
+        return stat() if stat else 0
+
+    @property
+    def size(self) -> int:
+        return self._pool_stat("size")
+
+    @property
+    def checked_out(self) -> int:
+        return self._pool_stat("checkedout")
+
+    @property
+    def checked_in(self) -> int:
+        return self._pool_stat("checkedin")
+
+    @property
+    def overflow(self) -> int:
+        # QueuePool reports negative overflow while the pool is still filling up
+        return max(0, self._pool_stat("overflow"))
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size,
+            "max_overflow": getattr(self._pool, "_max_overflow", 0),
+            "checked_out": self.checked_out,
+            "checked_in": self.checked_in,
+            "overflow": self.overflow,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": (self.wait_total / self.waits * 1000) if self.waits else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+            "wait_last_ms": self.wait_last * 1000
+        }
+
+
+_pool_metrics: dict[Any, PoolMetrics] = {}
+
+
+def build_engine(url: str, **kwargs) -> AsyncEngine:
+    """
+    Create an engine using the pool settings from `constants.py` and start tracking
+    its pool metrics.
+    """
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": {"prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE},
+        **kwargs
+    }
+
+    engine = create_async_engine(url, **options)
+    _pool_metrics[engine.sync_engine] = PoolMetrics(engine)
+
+    return engine
+
+
+def get_pool_metrics(db: AsyncEngine) -> Optional[PoolMetrics]:
+    return _pool_metrics.get(db.sync_engine)
+
+
+class Replica:
+    """Read-only engine paired with a primary. Skipped for a while after it fails."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.unavailable_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.unavailable_until
+
+    def mark_unavailable(self) -> None:
+        self.unavailable_until = time.monotonic() + DB_REPLICA_RETRY_SECONDS
+
+
+_replicas: dict[Any, Replica] = {}
+
+# Errors that mean the replica itself is unreachable, as opposed to a bad query
+_REPLICA_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, OSError)
+
+
+def attach_replica(db: AsyncEngine, url: str, **kwargs) -> AsyncEngine:
+    """
+    Build an engine for a read replica of `db`. Reads made with `replica=True` are
+    routed to it when no session is open.
+    """
+    engine = build_engine(url, **kwargs)
+    _replicas[db.sync_engine] = Replica(engine)
+
+    return engine
+
+
+def get_replica(db: AsyncEngine) -> Optional[AsyncEngine]:
+    replica = _replicas.get(db.sync_engine)
+    return replica.engine if replica else None
+
+
+async def _acquire(db: AsyncEngine) -> AsyncConnection:
+    metrics = _pool_metrics.get(db.sync_engine)
+    start = time.perf_counter()
+
+    try:
+        conn = await db.connect()
+    except PoolTimeoutError:
+        if metrics:
+            metrics.timeouts += 1
+        raise
+
+    if metrics:
+        metrics.record_wait(time.perf_counter() - start)
+
+    return conn
+
+
+class DBSession:
+    """
+    Unit of work shared by every execute_query call made while it is open.
+    All statements run on one connection inside one transaction. Writes that don't
+    need a result (QueryResultType.none) are queued and flushed in order before the
+    next read and on commit, so they never see a stale read and commit together.
+    """
+
+    def __init__(self, db: AsyncEngine):
+        self.db = db
+        self.active = False
+
+        self._conn: AsyncConnection = None
+        self._transaction: AsyncTransaction = None
+        self._pending: list[Union[FromClause, TableClause]] = []
+        self._after_commit: list[Callable[[], None]] = []
+        self._after_rollback: list[Callable[[], None]] = []
+        self._lock = asyncio.Lock()
+
+    async def begin(self) -> None:
+        self._conn = await _acquire(self.db)
+        self._transaction = await self._conn.begin()
+        self.active = True
+
+    async def _flush(self) -> None:
+        while self._pending:
+            query = self._pending.pop(0)
+
+            try:
+                await _run(self._conn, query, QueryResultType.none)
+            except Exception as e:
+                _log_write_error(query, e)
+                raise
+
+            _log_write_success(query)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            await self._flush()
+
+    async def execute(self, query: Union[FromClause, TableClause], result_type: QueryResultType = QueryResultType.single) -> Optional[Union[Row, list[Row]]]:
+        write = _is_write(query)
+
+        async with self._lock:
+            if not self.active:
+                # Session closed while we were waiting (e.g. a task spawned inside it)
+                return await _execute_on_engine(self.db, query, result_type)
+
+            if write and result_type == QueryResultType.none:
+                self._pending.append(query)
+                return None
+
+            await self._flush()
+
+            try:
+                value = await _run(self._conn, query, result_type)
+            except Exception as e:
+                if write:
+                    _log_write_error(query, e)
+                raise
+
+        if write:
+            _log_write_success(query)
+
+        return value
+
+    async def commit(self) -> None:
+        async with self._lock:
+            try:
+                await self._flush()
+                await self._transaction.commit()
+            except BaseException:
+                self._after_commit.clear()
+                self._run_callbacks(self._after_rollback, "after_rollback")
+                raise
+            finally:
+                await self._close()
+
+        self._after_rollback.clear()
+        self._run_callbacks(self._after_commit, "after_commit")
+
+    async def rollback(self) -> None:
+        async with self._lock:
+            self._pending.clear()
+            self._after_commit.clear()
+            try:
+                await self._transaction.rollback()
+            finally:
+                await self._close()
+                self._run_callbacks(self._after_rollback, "after_rollback")
+
+    @staticmethod
+    def _run_callbacks(callbacks: list[Callable[[], None]], name: str) -> None:
+        pending = callbacks[:]
+        callbacks.clear()
+
+        for callback in pending:
+            try:
+                callback()
+            except Exception:
+                log.exception("db.session.%s callback failed", name)
+
+    async def _close(self) -> None:
+        self.active = False
+        await self._conn.close()
+
+
+_current_session: ContextVar[Optional[DBSession]] = ContextVar("steward_db_session", default=None)
+
+
+@asynccontextmanager
+async def db_session(db: AsyncEngine) -> AsyncIterator[DBSession]:
+    """
+    Open a unit of work for `db`. Model methods called inside the block pick it up
+    automatically; nested blocks join the outer session instead of opening another.
+
+        async with db_session(bot.db):
+            await character.upsert()
+            await log_entry.upsert()
+    """
+    current = _current_session.get()
+
+    if current and current.active and current.db is db:
+        yield current
+        return
+
+    session = DBSession(db)
+    await session.begin()
+    token = _current_session.set(session)
+
+    try:
+        yield session
+    except BaseException:
+        _current_session.reset(token)
+        await session.rollback()
+        raise
+
+    _current_session.reset(token)
+    await session.commit()
+
+
+def after_commit(db: AsyncEngine, callback: Callable[[], None]) -> None:
+    """
+    Run `callback` once the current db_session for `db` commits, or straight away when
+    there is no session. Use it to update in-process caches only with durable data.
+    """
+    session = _current_session.get()
+
+    if session and session.active and session.db is db:
+        session._after_commit.append(callback)
+    else:
+        callback()
+
+
+def after_rollback(db: AsyncEngine, callback: Callable[[], None]) -> None:
+    """
+    Run `callback` if the current db_session for `db` rolls back or fails to commit.
+    Without a session a failed write raises straight to its caller, so nothing is registered.
+    Use it to drop in-process cache entries that were changed ahead of the write.
+    """
+    session = _current_session.get()
+
+    if session and session.active and session.db is db:
+        session._after_rollback.append(callback)
+
+
+async def execute_query(db: AsyncEngine, query: Union[FromClause, TableClause], result_type: QueryResultType = QueryResultType.single, session: Optional[DBSession] = None, replica: bool = False) -> Optional[Union[Row, list[Row]]]:
+    """
+    Run `query` against `db`, inside the current db_session if one is open.
+    Reads may opt into `replica=True` to use the read replica attached to `db`; writes
+    and anything inside a session always stay on the primary so they read their own writes.
+    """
+    if session is None:
+        session = _current_session.get()
+
+    if session and session.active and session.db is db:
+        return await session.execute(query, result_type)
+
+    if replica and not _is_write(query):
+        target = _replicas.get(db.sync_engine)
+
+        if target and target.available:
+            try:
+                return await _execute_on_engine(target.engine, query, result_type)
+            except _REPLICA_ERRORS as e:
+                target.mark_unavailable()
+                log.warning("db.replica.unavailable error=%s; falling back to primary", e)
+
+    return await _execute_on_engine(db, query, result_type)
+
+
+async def _execute_on_engine(db: AsyncEngine, query: Union[FromClause, TableClause], result_type: QueryResultType) -> Optional[Union[Row, list[Row]]]:
+    write = _is_write(query)
+
+    conn = await _acquire(db)
+
+    try:
+        if write:
+            async with conn.begin():
+                value = await _run(conn, query, result_type)
+        else:
+            value = await _run(conn, query, result_type)
+    except Exception as e:
+        if write:
+            _log_write_error(query, e)
+        raise
+    finally:
+        await conn.close()
+
+    if write:
+        _log_write_success(query)
+
+    return value
+
+
+# asyncpg caps a single statement at 32767 bind parameters
+MAX_BIND_PARAMS = 32767
+
+
+async def bulk_upsert(db: AsyncEngine, table: sa.Table, values: list[dict], index_elements: list[str], update_columns: Optional[list[str]] = None) -> list[Row]:
+    """
+    Insert many rows with one multi-row `INSERT ... ON CONFLICT DO UPDATE` per chunk and
+    return the written rows.
+    `update_columns` defaults to every supplied column outside `index_elements`; pass an
+    empty list to skip conflicting rows (`ON CONFLICT DO NOTHING`) instead, in which case
+    skipped rows are not returned.
+    """
+    if not values:
+        return []
+
+    columns = list(values[0].keys())
+
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in index_elements]
+
+    chunk_size = max(1, MAX_BIND_PARAMS // len(columns))
+    rows = []
+
+    for start in range(0, len(values), chunk_size):
+        query = insert(table).values(values[start:start + chunk_size])
+
+        if update_columns:
+            query = query.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={c: query.excluded[c] for c in update_columns}
+            )
+        else:
+            query = query.on_conflict_do_nothing(index_elements=index_elements)
+
+        rows.extend(
+            await execute_query(db, query.returning(table), QueryResultType.multiple)
+        )
+
+    return rows
+
+
+class BatchLoader:
+    """
+    Coalesces `load(db, key)` calls awaited in the same event-loop tick into a single
+    `load_many(db, keys)` call, which returns `{key: value}`; keys it leaves out resolve to None.
+    Callers inside an open db_session for `db` skip batching so they read the session's own writes.
+
+        rows = BatchLoader(fetch_rows_by_id)
+        a, b = await asyncio.gather(rows.load(db, id_a), rows.load(db, id_b))  # one query
+    """
+
+    def __init__(self, load_many: Callable[[AsyncEngine, list[Any]], Any], max_batch_size: int = MAX_BIND_PARAMS):
+        self.max_batch_size = max_batch_size
+
+        self.batches = 0
+        self.keys = 0
+
+        self._load_many = load_many
+        self._pending: dict[AsyncEngine, dict[Any, list[asyncio.Future]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._scheduled = False
+
+    async def load(self, db: AsyncEngine, key: Any) -> Any:
+        session = _current_session.get()
+
+        if session and session.active and session.db is db:
+            return (await self._load_many(db, [key])).get(key)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(db, {}).setdefault(key, []).append(future)
+
+        if not self._scheduled:
+            self._scheduled = True
+            # Runs after every callback already queued for this tick, e.g. the other tasks in a gather()
+            loop.call_soon(self._dispatch, context=Context())
+
+        return await future
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+
+        for db, waiters in pending.items():
+            keys = list(waiters)
+
+            for start in range(0, len(keys), self.max_batch_size):
+                batch = {key: waiters[key] for key in keys[start:start + self.max_batch_size]}
+                task = asyncio.ensure_future(self._resolve(db, batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, db: AsyncEngine, waiters: dict[Any, list[asyncio.Future]]) -> None:
+        self.batches += 1
+        self.keys += len(waiters)
+
+        try:
+            results = await self._load_many(db, list(waiters))
+        except Exception as e:
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in waiters.items():
+            value = results.get(key)
+
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
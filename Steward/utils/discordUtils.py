@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import operator
 import re
 from typing import Union
 import discord
@@ -383,4 +384,23 @@ async def get_last_message_in_channel(channel: discord.TextChannel) -> discord.M
             except:
                 pass
             
-    return last_message
\ No newline at end of file
+    return last_message
+
+def delegate_slots(target: str, base: type):
+    """
+    Class decorator for wrappers that subclass a discord model (e.g. Server(discord.Guild)).
+    Every `__slots__` attribute of `base` becomes a read-only property that reads through to
+    the wrapped object stored on `self.<target>`, so the wrapper always sees live discord state
+    and constructing one copies nothing.
+    """
+    def decorator(cls: type) -> type:
+        for klass in base.__mro__:
+            for name in getattr(klass, "__slots__", ()):
+                if name.startswith("__"):
+                    continue
+
+                setattr(cls, name, property(operator.attrgetter(f"{target}.{name}")))
+
+        return cls
+
+    return decorator
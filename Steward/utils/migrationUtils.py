@@ -0,0 +1,176 @@
+import logging
+import sqlalchemy as sa
+
+from datetime import datetime, timezone
+from typing import Callable
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from timeit import default_timer as timer
+
+from Steward.models import metadata
+
+log = logging.getLogger(__name__)
+
+# Kept out of `metadata` so the baseline create_all never touches it
+schema_version_table = sa.Table(
+    "schema_version",
+    sa.MetaData(),
+    sa.Column("version", sa.Integer, primary_key=True),
+    sa.Column("description", sa.String, nullable=False),
+    sa.Column("applied_ts", sa.TIMESTAMP(timezone=timezone.utc), nullable=False)
+)
+
+# Arbitrary key for pg_advisory_xact_lock so two instances never migrate at once
+MIGRATION_LOCK_KEY = 73_110_001
+
+
+class Migration:
+    """
+    One schema step. `upgrade` runs synchronously on a connection inside its own
+    transaction. Migrations after the baseline must be safe to run against a database
+    the baseline just created from the current models (use checkfirst / IF NOT EXISTS).
+    """
+
+    def __init__(self, version: int, description: str, upgrade: Callable[[Connection], None]):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+
+def _baseline(conn: Connection) -> None:
+    metadata.create_all(conn)
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    # Superseded by wider indexes declared on the tables
+    for name in ("idx_guild_player", "idx_log_guild_player"):
+        conn.execute(sa.text(f"DROP INDEX IF EXISTS {name}"))
+
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _player_statistics_jsonb(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+
+    data_type = conn.execute(
+        sa.text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'players' AND column_name = 'statistics'"
+        )
+    ).scalar()
+
+    if data_type == "json":
+        conn.execute(sa.text("ALTER TABLE players ALTER COLUMN statistics TYPE JSONB USING statistics::jsonb"))
+
+
+def _post_stats_tables(conn: Connection) -> None:
+    from Steward.models.objects.postStats import PostStats
+
+    for table in (PostStats.daily_table, PostStats.weekly_table, PostStats.monthly_table):
+        table.create(conn, checkfirst=True)
+
+    if conn.dialect.name != "postgresql":
+        return
+
+    # Backfill from the day buckets that used to live in players.statistics
+    conn.execute(sa.text(r"""
+        INSERT INTO post_stats_daily (guild_id, player_id, subject_type, subject_id, day, lines, words, chars, count)
+        SELECT p.guild_id, p.id, kind.key, subject.key, bucket.key::date,
+               COALESCE((bucket.value->>'num_lines')::int, 0),
+               COALESCE((bucket.value->>'num_words')::int, 0),
+               COALESCE((bucket.value->>'num_characters')::int, 0),
+               COALESCE((bucket.value->>'count')::int, 0)
+        FROM players p
+        CROSS JOIN LATERAL jsonb_each(p.statistics) kind
+        CROSS JOIN LATERAL jsonb_each(CASE WHEN jsonb_typeof(kind.value) = 'object' THEN kind.value ELSE '{}'::jsonb END) subject
+        CROSS JOIN LATERAL jsonb_each(CASE WHEN jsonb_typeof(subject.value) = 'object' THEN subject.value ELSE '{}'::jsonb END) bucket
+        WHERE kind.key IN ('character', 'npc')
+          AND bucket.key ~ '^\d{4}-\d{2}-\d{2}$'
+          AND jsonb_typeof(bucket.value) = 'object'
+        ON CONFLICT (guild_id, player_id, subject_type, subject_id, day) DO UPDATE SET
+            lines = post_stats_daily.lines + excluded.lines,
+            words = post_stats_daily.words + excluded.words,
+            chars = post_stats_daily.chars + excluded.chars,
+            count = post_stats_daily.count + excluded.count
+    """))
+
+    for table, unit in (("post_stats_weekly", "week"), ("post_stats_monthly", "month")):
+        conn.execute(sa.text(f"""
+            INSERT INTO {table} (guild_id, player_id, subject_type, subject_id, period_start, lines, words, chars, count)
+            SELECT guild_id, player_id, subject_type, subject_id, date_trunc('{unit}', day)::date,
+                   SUM(lines), SUM(words), SUM(chars), SUM(count)
+            FROM post_stats_daily
+            GROUP BY guild_id, player_id, subject_type, subject_id, date_trunc('{unit}', day)::date
+            ON CONFLICT (guild_id, player_id, subject_type, subject_id, period_start) DO UPDATE SET
+                lines = excluded.lines,
+                words = excluded.words,
+                chars = excluded.chars,
+                count = excluded.count
+        """))
+
+    conn.execute(sa.text(
+        "UPDATE players SET statistics = statistics - 'character' - 'npc' "
+        "WHERE statistics ?| array['character', 'npc']"
+    ))
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Baseline schema", _baseline),
+    Migration(2, "Hot path indexes", _hot_path_indexes),
+    Migration(3, "players.statistics to JSONB", _player_statistics_jsonb),
+    Migration(4, "Post statistics tables", _post_stats_tables),
+]
+
+
+def _lock(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(sa.text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def _current_version(conn: Connection) -> int:
+    schema_version_table.create(conn, checkfirst=True)
+    return conn.execute(sa.select(sa.func.max(schema_version_table.c.version))).scalar() or 0
+
+
+def _apply(conn: Connection, migration: Migration) -> bool:
+    _lock(conn)
+
+    # Re-read under the lock in case another instance got here first
+    if _current_version(conn) >= migration.version:
+        return False
+
+    migration.upgrade(conn)
+    conn.execute(
+        schema_version_table.insert().values(
+            version=migration.version,
+            description=migration.description,
+            applied_ts=datetime.now(timezone.utc)
+        )
+    )
+
+    return True
+
+
+async def run_migrations(db: AsyncEngine) -> int:
+    """Apply every pending migration in order and return the resulting schema version."""
+    async with db.begin() as conn:
+        version = await conn.run_sync(_current_version)
+
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+
+        start = timer()
+
+        async with db.begin() as conn:
+            applied = await conn.run_sync(_apply, migration)
+
+        if applied:
+            log.info(f"Applied migration {migration.version} ({migration.description}) in {timer() - start:.2f}s")
+
+        version = migration.version
+
+    return version
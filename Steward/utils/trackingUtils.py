@@ -0,0 +1,92 @@
+import logging
+import sqlalchemy as sa
+
+from collections import defaultdict
+from sqlalchemy.ext.asyncio import AsyncEngine
+from typing import Any, Optional
+
+from Steward.models.objects.enum import QueryResultType
+from Steward.utils.dbUtils import execute_query
+
+log = logging.getLogger(__name__)
+
+
+class TrackedMessageIndex:
+    """
+    In-process index of the Discord message and thread IDs we keep rows for, keyed by kind
+    ("request", "patrol", "application"). Delete listeners check it first so the deletions
+    that aren't ours never reach the database.
+
+    Until `load` has finished every lookup answers True and callers fall through to their
+    query as before. Only add/discard from the process that handles the guild's events.
+    """
+
+    def __init__(self):
+        self.loaded = False
+
+        self.hits = 0
+        self.skipped = 0
+
+        self._ids: defaultdict[str, set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._ids.values())
+
+    def add(self, kind: str, *ids: Optional[int]) -> None:
+        self._ids[kind].update(int(i) for i in ids if i)
+
+    def discard(self, kind: str, *ids: Optional[int]) -> None:
+        self._ids[kind].difference_update(int(i) for i in ids if i)
+
+    def might_track(self, kind: str, id: int) -> bool:
+        if not self.loaded or id in self._ids[kind]:
+            self.hits += 1
+            return True
+
+        self.skipped += 1
+        return False
+
+    async def load(self, db: AsyncEngine) -> int:
+        """
+        Read every tracked ID from the database. Merged into what is already indexed, so
+        anything added while the queries ran is kept; a discard that raced the load only
+        leaves a stale ID behind, which costs one query later.
+        """
+        for kind, query in self._queries().items():
+            rows = await execute_query(db, query, QueryResultType.multiple)
+
+            for row in rows:
+                self.add(kind, *row)
+
+        self.loaded = True
+
+        return len(self)
+
+    @staticmethod
+    def _queries() -> dict[str, Any]:
+        from Steward.models.objects.form import Application
+        from Steward.models.objects.patrol import Patrol
+        from Steward.models.objects.request import Request
+
+        requests = Request.request_table.c
+        patrols = Patrol.patrol_table.c
+        applications = Application.application_table.c
+
+        return {
+            "request": sa.select(requests.staff_message_id, requests.player_message_id),
+            "patrol": sa.select(patrols.pinned_message_id).where(
+                sa.and_(patrols.end_ts == sa.null(), patrols.pinned_message_id != sa.null())
+            ),
+            "application": sa.select(applications.message_id).where(applications.message_id != sa.null())
+        }
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "size": {kind: len(ids) for kind, ids in self._ids.items()},
+            "hits": self.hits,
+            "skipped": self.skipped
+        }
+
+
+tracked_messages = TrackedMessageIndex()
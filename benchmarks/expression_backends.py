@@ -0,0 +1,61 @@
+"""
+Per-evaluation time of the tree-walking StewardEvaluator against CompiledEvaluator.
+
+    PYTHONPATH=. python benchmarks/expression_backends.py
+
+Both share one ExpressionCache that is warmed first, so parsing and compiling are left
+out and only evaluation is timed. Correctness is covered by tests/test_expression_backends.py.
+"""
+import timeit
+
+import Steward.bot  # noqa: F401 - resolves the models' import cycle
+from Steward.models.automation.evaluators import CompiledEvaluator, ExpressionCache, SafeCharacter, StewardEvaluator
+
+NUMBER = 20_000
+REPEAT = 5
+
+EXPRESSIONS = [
+    "10",
+    "floor(level * 1.5) + 3",
+    "10 if character.level < 5 else 20",
+    "max(1, min(character.level, 20)) * 100",
+    "character.level >= 3 and character.xp > 1000",
+    "sum(x * 2 for x in range(20))"
+]
+
+
+class Character:
+    id = 1
+    name = "Character"
+    player_id = 1
+    guild_id = 1
+    level = 7
+    xp = 1234
+    currency = 10
+    primary_character = True
+    nickname = None
+    activity_points = 3
+    mention = "<@1>"
+
+
+def main() -> None:
+    names = {"character": SafeCharacter(Character()), "level": 7}
+    cache = ExpressionCache()
+    backends = [StewardEvaluator(cache=cache), CompiledEvaluator(cache=cache)]
+
+    print(f"{'expression':48} {'tree':>9} {'compiled':>9}   (us per eval, best of {REPEAT} x {NUMBER})")
+
+    for expr in EXPRESSIONS:
+        timings = []
+
+        for evaluator in backends:
+            evaluator.eval(expr, names)
+            best = min(timeit.repeat(lambda: evaluator.eval(expr, names), number=NUMBER, repeat=REPEAT))
+            timings.append(best / NUMBER * 1e6)
+
+        tree, compiled = timings
+        print(f"{expr:48} {tree:9.2f} {compiled:9.2f}   {tree / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Rows/sec turning query rows into models: a marshmallow Schema per row versus RowMapper.
+
+    PYTHONPATH=. python benchmarks/row_mapping.py
+
+Rows are built in memory with the column types the driver returns, so only the mapping
+is timed.
+"""
+import timeit
+import uuid
+
+from decimal import Decimal
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from Steward.models.objects.auctionHouse import AuctionHouse
+from Steward.models.objects.character import Character
+from Steward.models.objects.npc import NPC
+
+COUNT = 10_000
+REPEAT = 5
+
+
+def rows(data: list[dict]) -> list:
+    keys = list(data[0])
+    return IteratorResult(SimpleResultMetaData(keys), iter([tuple(d[k] for k in keys) for d in data])).all()
+
+
+def character(i: int) -> dict:
+    return {
+        "id": uuid.uuid4(), "name": f"Character {i}", "level": 5, "species_str": "Elf", "class_str": "Wizard",
+        "guild_id": 1234, "player_id": 5678 + i, "active": True, "primary_character": False, "channels": [1, 2],
+        "avatar_url": None, "nickname": None, "currency": Decimal("105.50"), "activity_points": 3, "xp": 1200,
+        "limited_xp": 0, "limited_currency": 0
+    }
+
+
+def npc(i: int) -> dict:
+    return {"key": f"npc{i}", "guild_id": 1234, "name": f"NPC {i}", "avatar_url": None, "roles": [1, 2], "adventure_id": None}
+
+
+def auction_house(i: int) -> dict:
+    return {
+        "id": uuid.uuid4(), "name": f"House {i}", "guild_id": 1234, "channel_id": 1, "message_id": i,
+        "min_bid_percent": Decimal("50"), "auction_length": Decimal("24"), "reroll_interval": Decimal("168"),
+        "action_log_activity_name": None
+    }
+
+
+def main() -> None:
+    cases = [
+        ("Character", rows([character(i) for i in range(COUNT)]),
+         lambda rs: [Character.CharacterSchema(None).load(dict(r._mapping)) for r in rs],
+         lambda rs: Character.from_row.all(None, rs)),
+        ("NPC", rows([npc(i) for i in range(COUNT)]),
+         lambda rs: [NPC.NPCSchema(None).load(dict(r._mapping)) for r in rs],
+         lambda rs: NPC.from_row.all(None, rs)),
+        ("AuctionHouse", rows([auction_house(i) for i in range(COUNT)]),
+         lambda rs: [AuctionHouse.AuctionHouseSchema(None).load(dict(r._mapping)) for r in rs],
+         lambda rs: AuctionHouse.from_row.all(None, rs)),
+    ]
+
+    print(f"{COUNT:,} rows, best of {REPEAT}; rows/sec")
+
+    for name, data, schema, mapper in cases:
+        old = min(timeit.repeat(lambda: schema(data), number=1, repeat=REPEAT))
+        new = min(timeit.repeat(lambda: mapper(data), number=1, repeat=REPEAT))
+
+        print(f"{name:14} schema {COUNT / old:>12,.0f}   RowMapper {COUNT / new:>12,.0f}   ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+tracemalloc comparison of the `__slots__` models against the same classes with a
+per-instance `__dict__`.
+
+    PYTHONPATH=. python benchmarks/slots_memory.py
+
+The "dict" variant reuses each model's own `__init__` on a plain class, so both sides
+run identical constructor code. Field values are shared between objects apart from one
+fresh list per object, so the numbers are the objects' own footprint.
+"""
+import gc
+import tracemalloc
+import uuid
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import Steward.bot  # noqa: F401 - resolves the models' import cycle
+from Steward.models.objects.activityPoints import ActivityPoints
+from Steward.models.objects.auctionHouse import StockItem
+from Steward.models.objects.character import Character
+from Steward.models.objects.levels import Levels
+from Steward.models.objects.log import StewardLog
+from Steward.models.objects.npc import NPC
+
+NOW = datetime.now(timezone.utc)
+ID = uuid.uuid4()
+
+
+def with_dict(cls: type) -> type:
+    """`cls` without `__slots__`: same constructor, instances keep a `__dict__`."""
+    return type(f"{cls.__name__}Dict", (), {"__init__": cls.__init__})
+
+
+CASES = [
+    (Character, 50_000, lambda cls: cls(
+        None, id=ID, name="Character", level=5, species_str="Elf", class_str="Wizard", guild_id=1, player_id=2,
+        channels=[], currency=Decimal("10.00"), activity_points=3, xp=1200
+    )),
+    (StewardLog, 100_000, lambda cls: cls(
+        None, id=ID, author_id=1, player_id=2, guild_id=3, character_id=ID, currency=Decimal("5.00"),
+        xp=Decimal("100.00"), notes="notes", created_ts=NOW
+    )),
+    (StockItem, 50_000, lambda cls: cls(None, id=ID, item_id=ID, shelf_id=ID, bids={}, auction_start=NOW)),
+    (Levels, 50_000, lambda cls: cls(None, 1, 5, 6500, 2)),
+    (ActivityPoints, 50_000, lambda cls: cls(None, guild_id=1, level=2, points=3, xp_expr="100", currency_expr="0")),
+    (NPC, 50_000, lambda cls: cls(None, 1, "npc", "NPC", roles=[]))
+]
+
+
+def allocated(build, count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    objects = [build() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - start
+
+    tracemalloc.stop()
+    del objects
+
+    return size
+
+
+def main() -> None:
+    print(f"{'model':24} {'__dict__':>20} {'__slots__':>20}")
+
+    for cls, count, build in CASES:
+        plain = with_dict(cls)
+        old = allocated(lambda: build(plain), count)
+        new = allocated(lambda: build(cls), count)
+
+        print(
+            f"{count // 1000}k {cls.__name__:20} "
+            f"{old / 2**20:8.1f} MiB ({old // count:4} B) "
+            f"{new / 2**20:8.1f} MiB ({new // count:4} B)"
+        )
+
+
+if __name__ == "__main__":
+    main()
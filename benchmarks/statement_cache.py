@@ -0,0 +1,92 @@
+"""
+Per-call CPU that execute_query spends on a statement before it reaches the database.
+
+    PYTHONPATH=. python benchmarks/statement_cache.py
+
+"before" is what every call used to do: `str(query)` and `query.compile().params`.
+"after" is what `_run` does now: `QueryStats.record`, which every statement pays, plus
+`describe_query` for writes (the write log is at INFO, which is assumed enabled here).
+`record` is handed the statement SQLAlchemy compiled for execution, as `_run` does.
+"""
+import time
+import uuid
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from Steward.models.objects.character import Character
+from Steward.models.objects.servers import Server
+from Steward.utils.dbUtils import QueryStats, describe_query
+
+NUMBER = 200
+REPEAT = 3
+
+
+def before(query):
+    try:
+        query_str = str(query)
+    except Exception:
+        query_str = repr(query)
+
+    try:
+        query_params = query.compile().params
+    except Exception:
+        query_params = None
+
+    return query_str, query_params
+
+
+def after(query, compiled, stats: QueryStats, write: bool):
+    stats.record(query, 0.0, 1, compiled)
+
+    if write:
+        describe_query(query)
+
+
+def queries():
+    characters = Character.characters_table
+
+    yield "Server.get_or_create (read)", lambda: Server._hydration_query(1234), False
+    yield "Character.fetch (read)", lambda: characters.select().where(characters.c.id.in_([uuid.uuid4()])), False
+    yield "Character.upsert (write)", lambda: (
+        characters.update()
+        .where(characters.c.id == uuid.uuid4())
+        .values(name="name", level=3, xp=100, currency=10)
+        .returning(characters)
+    ), True
+
+
+def best(process, build) -> float:
+    # Every call gets a fresh statement, as the models build one per call; building them
+    # happens outside the timed loop
+    times = []
+
+    for _ in range(REPEAT):
+        statements = [build() for _ in range(NUMBER)]
+        start = time.perf_counter()
+
+        for query in statements:
+            process(query)
+
+        times.append(time.perf_counter() - start)
+
+    return min(times) / NUMBER * 1e6
+
+
+def main() -> None:
+    print(f"{'query':32} {'before':>10} {'after':>10}   (us per call, best of {REPEAT} x {NUMBER})")
+
+    dialect = asyncpg.dialect()
+
+    for name, build, write in queries():
+        # SQLAlchemy's own cache hands _run the same compiled statement for every call of a shape
+        compiled = build().compile(dialect=dialect)
+        stats = QueryStats()
+
+        old = best(before, build)
+        new = best(lambda query: after(query, compiled, stats, write), build)
+
+        print(f"{name:32} {old:10.1f} {new:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
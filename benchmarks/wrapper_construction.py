@@ -0,0 +1,87 @@
+"""
+Cost of building 10k Server and Player wrappers around a discord Guild/Member.
+
+    PYTHONPATH=. python benchmarks/wrapper_construction.py
+
+"before" copies every `__slots__` entry of the discord object onto the wrapper, the way
+Server/Player used to; "after" is the current `delegate_slots` construction.
+"""
+import timeit
+import tracemalloc
+
+import discord
+
+from Steward.models.objects.player import Player
+from Steward.models.objects.servers import Server
+
+COUNT = 10_000
+REPEAT = 5
+
+
+def stub(cls: type):
+    """A discord object with every slot filled, without a gateway payload."""
+    obj = cls.__new__(cls)
+
+    for klass in cls.__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            try:
+                setattr(obj, name, None)
+            except AttributeError:
+                pass
+
+    return obj
+
+
+def copy_slots(wrapper, source) -> None:
+    for attr in source.__slots__:
+        try:
+            setattr(wrapper, attr, getattr(source, attr))
+        except AttributeError:
+            pass
+
+
+class CopyingServer(discord.Guild):
+    def __init__(self, db, guild, **kwargs):
+        copy_slots(self, guild)
+        Server.__init__(self, db, guild, **kwargs)
+
+
+class CopyingPlayer(discord.Member):
+    def __init__(self, db, member, **kwargs):
+        copy_slots(self, member)
+        Player.__init__(self, db, member, **kwargs)
+
+
+def measure(build) -> tuple[float, float]:
+    seconds = min(timeit.repeat(lambda: [build() for _ in range(COUNT)], number=1, repeat=REPEAT))
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [build() for _ in range(COUNT)]
+    size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    del objects
+
+    return seconds * 1000, size / COUNT
+
+
+def main() -> None:
+    guild = stub(discord.Guild)
+    member = stub(discord.Member)
+
+    cases = [
+        ("Server", lambda: CopyingServer(None, guild), lambda: Server(None, guild)),
+        ("Player", lambda: CopyingPlayer(None, member), lambda: Player(None, member))
+    ]
+
+    print(f"{COUNT:,} constructions, best of {REPEAT}")
+
+    for name, old, new in cases:
+        old_ms, old_bytes = measure(old)
+        new_ms, new_bytes = measure(new)
+
+        print(f"{name:8} before {old_ms:7.1f} ms {old_bytes:7.0f} B/obj   after {new_ms:7.1f} ms {new_bytes:7.0f} B/obj")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,38 @@ def normalize_database_url(url: str) -> str:
 
 
 DB_URL = normalize_database_url(os.environ.get("DATABASE_URL", ""))
+# Optional read replica; reads that opt in are routed here and fall back to DB_URL
+DB_REPLICA_URL = normalize_database_url(os.environ.get("DATABASE_REPLICA_URL", ""))
+DB_REPLICA_RETRY_SECONDS = float(os.environ.get("DB_REPLICA_RETRY_SECONDS", 30))
+
+# Connection pool
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# asyncpg prepared statements cached per connection; set to 0 behind pgbouncer (transaction mode)
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.environ.get("DB_PREPARED_STATEMENT_CACHE_SIZE", 100))
+
+# Query timing
+DB_SLOW_QUERY_MS = float(os.environ.get("DB_SLOW_QUERY_MS", 250))
+DB_QUERY_STATS_SAMPLES = int(os.environ.get("DB_QUERY_STATS_SAMPLES", 512))
+
+# Seconds between flushes of buffered player command counters
+COMMAND_STATS_FLUSH_SECONDS = float(os.environ.get("COMMAND_STATS_FLUSH_SECONDS", 30))
+
+# Hydrated Server/Player objects are reused for this many seconds unless invalidated by a write.
+# Writes are broadcast to every process over Postgres NOTIFY, so these can be long.
+SERVER_CACHE_TTL = float(os.environ.get("SERVER_CACHE_TTL", 3600))
+SERVER_CACHE_SIZE = int(os.environ.get("SERVER_CACHE_SIZE", 5000))
+RULES_CACHE_TTL = float(os.environ.get("RULES_CACHE_TTL", 3600))
+PLAYER_CACHE_TTL = float(os.environ.get("PLAYER_CACHE_TTL", 900))
+PLAYER_CACHE_SIZE = int(os.environ.get("PLAYER_CACHE_SIZE", 5000))
+
+# Parsed automation expressions kept in memory, keyed by expression text
+EXPRESSION_CACHE_SIZE = int(os.environ.get("EXPRESSION_CACHE_SIZE", 2048))
+# "compiled" turns each expression into closures once; "tree" walks the AST every time
+EXPRESSION_BACKEND = os.environ.get("EXPRESSION_BACKEND", "compiled")
 
 # Symbols
 CHANNEL_BREAK = "```\n​ \n```"
@@ -0,0 +1,66 @@
+"""
+Server and Player wrap a discord Guild/Member and delegate its attributes. get_or_create
+must unwrap a wrapper it is handed instead of wrapping (or re-pointing a cached one at) itself.
+
+    python -m unittest discover -s tests -t .
+"""
+import unittest
+
+import discord
+
+import Steward.bot  # noqa: F401 - resolves the models' import cycle
+from Steward.models.objects.player import Player
+from Steward.models.objects.servers import Server
+
+
+def stub(cls: type, **attrs):
+    """A discord object with every slot filled, without a gateway payload."""
+    obj = cls.__new__(cls)
+
+    for klass in cls.__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            try:
+                setattr(obj, name, None)
+            except AttributeError:
+                pass
+
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+
+    return obj
+
+
+class TestGetOrCreateUnwraps(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.db = object()
+        self.guild = stub(discord.Guild, id=1, name="Guild")
+        self.member = stub(discord.Member, guild=self.guild, _user=stub(discord.User, id=2, name="member"))
+
+    def tearDown(self):
+        Server._cache.clear()
+        Player._cache.clear()
+
+    async def test_server_from_cached_server(self):
+        server = Server(self.db, self.guild)
+        Server._cache.set(self.guild.id, server)
+
+        result = await Server.get_or_create(self.db, server)
+
+        self.assertIs(result, server)
+        self.assertIs(result._guild, self.guild)
+        self.assertEqual(result.name, "Guild")
+
+    async def test_player_from_cached_player(self):
+        player = Player(self.db, self.member)
+        Player._cache.set((self.guild.id, self.member.id), player)
+
+        result = await Player.get_or_create(self.db, player)
+
+        self.assertIs(result, player)
+        self.assertIs(result._member, self.member)
+        self.assertEqual(result.id, 2)
+        self.assertEqual(result.guild.id, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
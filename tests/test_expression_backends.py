@@ -0,0 +1,228 @@
+"""
+Differential tests: CompiledEvaluator must give the same values, errors and statement/loop
+counts as the tree-walking StewardEvaluator it replaces.
+
+    python -m unittest discover -s tests -t .
+"""
+import random
+import re
+import types
+import unittest
+
+import Steward.bot  # noqa: F401 - resolves the models' import cycle
+from Steward.models.automation.evaluators import CompiledEvaluator, ExpressionCache, SafeCharacter, StewardConfig, StewardEvaluator, evaluate_many
+from Steward.models.automation.exceptions import LimitException, StewardAutomationException
+
+
+class Obj:
+    level = 7
+    xp = 1234
+    currency = 10.5
+    name = "Bob"
+    _secret = 1
+
+    def format(self):
+        return 1
+
+    def get_xp_for_level(self, level):
+        return level * 1000
+
+    def __repr__(self):
+        return "Obj"
+
+
+def names() -> dict:
+    return {
+        "level": 7, "xp": 1234.5, "n": None, "s": "abc", "lst": [1, 2, 3, 4], "d": {"a": 1, "b": [1, 2]},
+        "obj": Obj(), "pairs": [(1, 2), (3, 4)], "bad": [(1, 2, 3)], "big": 10**7, "t": (1, 2),
+        "char": SafeCharacter(Obj())
+    }
+
+
+CONFIGS = {
+    "default": StewardConfig(),
+    "tight limits": StewardConfig(max_statements=12, max_loops=5, max_const_len=2, max_power=3, max_power_base=5),
+    "custom disallow": StewardConfig(disallow_prefixes=["l"], disallow_methods=["upper"])
+}
+
+CORPUS = [
+    # Arithmetic, comparisons and boolean logic
+    "1", "1 + 2 * 3", "level * 1.5", "floor(level * 1.5) + 3", "10 if level < 5 else 20", "-level", "+level", "~level",
+    "not level", "level ** 2", "big ** 2", "2 ** 2000", "level // 2", "level % 3", "level / 0", "level & 1", "level @ 2",
+    "level << 2", "1 < level < 10", "1 < level > 10", "level == 7 == 7.0", "level is None", "n is None", "n is not None",
+    "1 in lst", "9 not in lst", "level and xp", "0 and xp", "n or s", "n or 0 or ''", "level and n and s",
+    "1 < 'a'", "'a' + 1", "-s", "not not s", "lst == [1, 2, 3, 4]", "level in 5",
+    # Comprehensions and their targets
+    "max(1, min(level, 20)) * 100", "sum(x*2 for x in range(level))", "[x for x in lst if x % 2]",
+    "[x*y for x in lst for y in lst if x != y]", "[(a, b) for a, b in pairs]", "[a for a, b in bad]", "[a for a, b in lst]",
+    "[a for a.b in lst]", "[a for [a, b] in pairs]", "(x for x in lst)", "(x for x in undefined_name)", "(y for x in lst)",
+    "sum(y for x in lst)", "[x for x in lst if x if x > 1]", "[[y for y in range(x)] for x in lst]",
+    "list((x, y) for x in lst for y in (x,))", "(x for x in lst).__next__", "[g for g in (x for x in lst)]",
+    "[i for i, v in enumerate(lst)]", "[i for i, v in enumerate(lst) if v]", "all(x > 0 for x in lst)", "any(x > 3 for x in lst)",
+    # Attributes, subscripts and calls
+    "obj.level", "obj._secret", "obj.format", "obj.nope", "obj.get_xp_for_level(3)", "obj.__class__", "s.format_map",
+    "obj.level.real", "d['b'][1]", "s.upper()", "s.mro", "lst.count(1)", "{}[1]", "enumerate(lst)",
+    "d['a']", "d['z']", "lst[10]", "lst[1:2]", "lst[-1]", "s[0]", "level[0]", "d.get('a')", "char.level", "char.format",
+    "{'a': 1, 'b': level}", "{**d}", "{'a': 1, **d}", "{1, 2}", "[1, *lst]", "f(*lst)", "max(*lst)", "max(lst, key=abs)",
+    "max(lst, **d)", "(1, level, s)", "[]", "()", "round(xp, 1)", "int('x')", "str(level) + s", "typeof(level)",
+    "getattr(obj, 'level')", "getattr(n, 'x', 5)", "sqrt(level)", "abs(-3)", "time() > 0",
+    # Limits
+    "'a' * 300000", "'a' * 10", "len('" + "a" * 200001 + "')", "[x for x in range(20000)]",
+    "sum(1 for x in range(3000) for y in range(4))", "1 if [x for x in range(10001)] else 0",
+    # Unsupported syntax and parse errors
+    "undefined", "level()", "lambda: 1", "f'{level}'", "(z := 1)", "x if True else (lambda: 1)", "(lambda: 1) if False else 2",
+    "True", "None", "...", "1j * 2", "b'abc'", "1 +", "(((", "", "a, b = 1, 2", "level if level else"
+]
+
+
+def random_expression(rng: random.Random, depth: int = 0) -> str:
+    leaves = ["level", "xp", "n", "s", "lst", "d", "obj", "1", "0", "2", "-3", "'x'", "True", "None", "t", "big", "undefined", "char"]
+
+    if depth > 3 or rng.random() < 0.3:
+        return rng.choice(leaves)
+
+    e = lambda: random_expression(rng, depth + 1)
+
+    return rng.choice([
+        lambda: f"({e()} {rng.choice(['+', '-', '*', '/', '//', '%', '**', '&', '|'])} {e()})",
+        lambda: f"({rng.choice(['-', '+', 'not ', '~'])}{e()})",
+        lambda: f"({e()} {rng.choice(['<', '<=', '==', '!=', '>', '>=', 'in', 'not in', 'is', 'is not'])} {e()} {rng.choice(['', '< 5'])})",
+        lambda: f"({e()} {rng.choice(['and', 'or'])} {e()} {rng.choice(['and', 'or'])} {e()})",
+        lambda: f"({e()} if {e()} else {e()})",
+        lambda: f"{rng.choice(['max', 'min', 'len', 'abs', 'sum', 'str', 'int', 'floor', 'getattr', 'round'])}({e()}{rng.choice(['', ', ' + e()])})",
+        lambda: f"[{e()}, {e()}]",
+        lambda: f"({e()}, {e()})",
+        lambda: f"{{{e()}: {e()}}}",
+        lambda: f"{e()}[{e()}]",
+        lambda: f"{e()}.{rng.choice(['level', 'xp', '_secret', 'format', 'real', 'upper', 'nope', 'get'])}",
+        lambda: f"[{e()} for x in {e()} if {e()}]",
+        lambda: f"sum(x for x in {rng.choice(['lst', 'range(5)', 't', e()])})",
+        lambda: f"[x + y for x in lst for y in {e()}]",
+        lambda: f"({e()} for x in lst)",
+        lambda: f"[a for a, b in {rng.choice(['pairs', 'bad', 'lst', e()])}]"
+    ])()
+
+
+def _normalize(text: str) -> str:
+    # Generator objects differ in qualname and address between the backends
+    text = re.sub(r"<generator object [\w.<>]+ at 0x[0-9a-f]+>", "<generator>", text)
+    return re.sub(r" at 0x[0-9a-f]+", "", text)
+
+
+def outcome(evaluator: StewardEvaluator, expr: str) -> tuple:
+    """Value or error of one evaluation, plus the statement/loop counters it left behind."""
+    try:
+        value = evaluator.eval(expr, names())
+        counts = (evaluator.statement_count, evaluator.loop_count)
+
+        if isinstance(value, types.GeneratorType):
+            # Consumed after eval returns, so the counters above are already final
+            try:
+                value = ("generator", list(value))
+            except Exception as e:
+                value = ("generator error", type(e), str(e))
+
+        return ("ok", _normalize(repr(value))), counts
+    except StewardAutomationException as e:
+        # The tree-walker reports the failing node; compare its position, not the object
+        node = (type(e.node).__name__, getattr(e.node, "lineno", None), getattr(e.node, "col_offset", None)) if e.node is not None else None
+        return ("error", type(e), _normalize(e.msg), node, getattr(e, "expr", None)), (evaluator.statement_count, evaluator.loop_count)
+    except Exception as e:
+        return ("raised", type(e), _normalize(str(e))), (evaluator.statement_count, evaluator.loop_count)
+
+
+class TestCompiledMatchesTreeWalker(unittest.TestCase):
+    RANDOM_EXPRESSIONS = 2000
+
+    def assert_same(self, config: StewardConfig, expressions: list[str]) -> None:
+        cache = ExpressionCache()
+
+        for expr in expressions:
+            with self.subTest(expr=expr[:80]):
+                tree = outcome(StewardEvaluator(config=config, cache=cache), expr)
+                compiled = outcome(CompiledEvaluator(config=config, cache=cache), expr)
+
+                self.assertEqual(tree, compiled)
+
+    def test_corpus(self):
+        for name, config in CONFIGS.items():
+            with self.subTest(config=name):
+                self.assert_same(config, CORPUS)
+
+    def test_random_expressions(self):
+        rng = random.Random(22)
+        expressions = [random_expression(rng) for _ in range(self.RANDOM_EXPRESSIONS)]
+
+        for name, config in CONFIGS.items():
+            with self.subTest(config=name):
+                self.assert_same(config, expressions)
+
+
+class TestEvaluatorCache(unittest.TestCase):
+    def test_empty_cache_is_used(self):
+        # ExpressionCache defines __len__, so an empty one is falsy; it must still be used
+        for backend in (StewardEvaluator, CompiledEvaluator):
+            with self.subTest(backend=backend.__name__):
+                cache = ExpressionCache()
+                evaluator = backend(cache=cache)
+
+                self.assertIs(evaluator.cache, cache)
+                self.assertEqual(evaluator.eval("level + 1", {"level": 1}), 2)
+                self.assertEqual(len(cache), 1)
+
+    def test_hits_counted_once_per_evaluation(self):
+        cache = ExpressionCache()
+        cache.parse("level + 1")
+
+        for _ in range(3):
+            self.assertEqual(cache.evaluate("level + 1", level=1), 2)
+
+        self.assertEqual(evaluate_many("level + 1", [None, None], cache=cache, level=1), [2, 2])
+
+        # One parse, then one hit per evaluation; classifying or inspecting the tree is not a lookup
+        self.assertEqual((cache.misses, cache.hits), (1, 4))
+
+
+class TestEvaluateMany(unittest.TestCase):
+    def test_mutable_result_not_shared(self):
+        results = evaluate_many("[1, 2]", [None, None, None], cache=ExpressionCache())
+
+        self.assertEqual(results, [[1, 2]] * 3)
+        self.assertEqual(len({id(result) for result in results}), 3)
+
+
+class TestCompiledLimits(unittest.TestCase):
+    """Each limit raises the same exception, with the same message, from both backends."""
+
+    CASES = [
+        ("statements", StewardConfig(max_statements=10), "1 + 1 + 1 + 1 + 1 + 1 + 1 + 1 + 1 + 1 + 1"),
+        ("loops", StewardConfig(max_loops=5), "[x for x in range(6)]"),
+        ("nested loops", StewardConfig(max_loops=10), "[x * y for x in range(4) for y in range(4)]"),
+        ("power", StewardConfig(max_power=3), "2 ** 4"),
+        ("power base", StewardConfig(max_power_base=5), "6 ** 2"),
+        ("constant length", StewardConfig(max_const_len=3), "'abcd'"),
+        ("private attribute", StewardConfig(), "obj._secret"),
+        ("disallowed method", StewardConfig(), "s.format"),
+        ("custom prefix", StewardConfig(disallow_prefixes=["le"]), "obj.level")
+    ]
+
+    def test_limits(self):
+        for name, config, expr in self.CASES:
+            with self.subTest(limit=name):
+                tree = outcome(StewardEvaluator(config=config), expr)
+                compiled = outcome(CompiledEvaluator(config=config), expr)
+
+                self.assertEqual(tree[0][0], "error", f"{expr!r} should fail under the tree-walker")
+                self.assertEqual(tree, compiled)
+
+    def test_recursion_limit(self):
+        expr = "1" + " + 1" * 5000
+
+        for evaluator in (StewardEvaluator(), CompiledEvaluator()):
+            with self.subTest(backend=type(evaluator).__name__):
+                with self.assertRaises(LimitException):
+                    evaluator.eval(expr, {})
+
+
+if __name__ == "__main__":
+    unittest.main()